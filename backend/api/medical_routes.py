@@ -1,5 +1,5 @@
 # backend/api/medical_routes.py - FIXED VERSION
-from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
 from fastapi.responses import JSONResponse, FileResponse
 import logging
 import json
@@ -170,18 +170,30 @@ async def search_patients_by_condition(
 @medical_router.get("/patients/with_allergies")
 async def get_allergy_patients(
     allergy_type: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
     request: Request = None, 
     config=Depends(get_config_dep)
 ):
-    """Get patients with allergies from MongoDB"""
+    """Get patients with allergies from MongoDB
+
+    allergy_type is a case-insensitive prefix: "penicillin" matches "Penicillin (rash)"
+    but not "Amoxicillin/penicillin". At most `limit` patients are returned,
+    newest first; `truncated` tells whether more matched.
+    """
     try:
         mongodb_client = get_mongodb_client(request)
-        patients = mongodb_client.get_patients_with_allergies(allergy_type)
+        # One extra row tells whether the list was cut off at the limit
+        patients = mongodb_client.get_patients_with_allergies(allergy_type, limit + 1)
+        truncated = len(patients) > limit
+        patients = patients[:limit]
         
         return JSONResponse(content={
             "success": True,
             "allergy_filter": allergy_type,
+            "allergy_match": "case_insensitive_prefix" if allergy_type else None,
             "patient_count": len(patients),
+            "limit": limit,
+            "truncated": truncated,
             "patients": patients
         })
         
@@ -239,11 +239,8 @@ async def get_all_notes(request: Request, config = Depends(get_config_dep)):
         # Get all completed sessions from Redis
         all_notes = []
         
-        # Search for all session status keys
-        session_keys = audio_handler.redis_client.client.keys("session_status:*")
-        
-        for key in session_keys:
-            session_id = key.split(":")[-1]
+        # Scan session status keys, fetching full status only for completed sessions
+        for session_id in audio_handler.redis_client.scan_session_ids(status="completed"):
             status_data = audio_handler.get_session_status(session_id)
             
             if status_data and status_data.get("status") == "completed":
@@ -287,8 +284,8 @@ async def cleanup_session(session_id: str, request: Request, config = Depends(ge
         # Clean up files
         success = audio_handler.cleanup_session_files(session_id)
         
-        # Also remove from Redis
-        audio_handler.redis_client.client.delete(f"session_status:{session_id}")
+        # Also remove from Redis (UNLINK reclaims memory off the main thread)
+        audio_handler.redis_client.client.unlink(f"session_status:{session_id}")
         
         if success:
             message = "Session cleaned up successfully"
@@ -307,17 +304,15 @@ async def get_queue_status(request: Request, config = Depends(get_config_dep)):
     try:
         audio_handler = AudioHandler(config)
         
-        # Get stream info for both streams
-        direct_stream_info = audio_handler.redis_client.get_stream_info(config.AUDIO_INPUT_STREAM)
-        chunk_stream_info = audio_handler.redis_client.get_stream_info(config.AUDIO_CHUNK_STREAM)
-        
-        # Get pending messages for consumer groups
-        direct_pending = audio_handler.redis_client.get_pending_messages(
-            config.AUDIO_INPUT_STREAM, config.CONSUMER_GROUP
-        )
-        chunk_pending = audio_handler.redis_client.get_pending_messages(
-            config.AUDIO_CHUNK_STREAM, config.CHUNK_CONSUMER_GROUP
-        )
+        # Get stream info and pending messages for both streams in one round-trip
+        snapshot = audio_handler.redis_client.get_streams_snapshot({
+            config.AUDIO_INPUT_STREAM: config.CONSUMER_GROUP,
+            config.AUDIO_CHUNK_STREAM: config.CHUNK_CONSUMER_GROUP,
+        })
+        direct_stream_info = snapshot[config.AUDIO_INPUT_STREAM]["info"]
+        chunk_stream_info = snapshot[config.AUDIO_CHUNK_STREAM]["info"]
+        direct_pending = snapshot[config.AUDIO_INPUT_STREAM]["pending"]
+        chunk_pending = snapshot[config.AUDIO_CHUNK_STREAM]["pending"]
         
         return JSONResponse(content={
             "success": True,
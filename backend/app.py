@@ -16,13 +16,13 @@ from core.redis_client import RedisClient
 
 # Try to import MongoDB client
 try:
-    from core.mongodb_client import MongoDBClient, HybridStorageClient
+    from core.mongodb_client import HybridStorageClient, get_mongodb_client
     MONGODB_AVAILABLE = True
 except ImportError as e:
     logging.warning(f"MongoDB client not available: {e}")
     MONGODB_AVAILABLE = False
-    MongoDBClient = None
     HybridStorageClient = None
+    get_mongodb_client = None
 
 # FIXED: Import medical extraction routes properly
 try:
@@ -66,7 +66,8 @@ async def lifespan(app: FastAPI):
     mongodb_client = None
     if MONGODB_AVAILABLE and config_obj.ENABLE_MONGODB:
         try:
-            mongodb_client = MongoDBClient(
+            # Shared per-process client; routes reach it through app.state
+            mongodb_client = get_mongodb_client(
                 connection_string=config_obj.MONGODB_CONNECTION_STRING,
                 database_name=config_obj.MONGODB_DATABASE_NAME
             )
@@ -197,10 +198,16 @@ def create_app(config_name=None):
         # Check queue depths
         try:
             redis_client = app.state.redis_client
+            config = app.state.config
+            snapshot = redis_client.get_streams_snapshot({
+                config.AUDIO_INPUT_STREAM: None,
+                config.AUDIO_CHUNK_STREAM: None,
+                config.MEDICAL_EXTRACTION_STREAM: None,
+            })
             status["queues"] = {
-                "direct": redis_client.get_stream_info(app.state.config.AUDIO_INPUT_STREAM).get("length", 0),
-                "chunks": redis_client.get_stream_info(app.state.config.AUDIO_CHUNK_STREAM).get("length", 0),
-                "medical": redis_client.get_stream_info(app.state.config.MEDICAL_EXTRACTION_STREAM).get("length", 0)
+                "direct": snapshot[config.AUDIO_INPUT_STREAM]["info"].get("length", 0),
+                "chunks": snapshot[config.AUDIO_CHUNK_STREAM]["info"].get("length", 0),
+                "medical": snapshot[config.MEDICAL_EXTRACTION_STREAM]["info"].get("length", 0)
             }
         except:
             pass
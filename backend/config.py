@@ -66,7 +66,13 @@ class Config:
     # Worker settings
     WORKER_TIMEOUT = int(os.environ.get("WORKER_TIMEOUT", 3600))
     CHUNK_WORKER_TIMEOUT = int(os.environ.get("CHUNK_WORKER_TIMEOUT", 120))
-    WORKER_BLOCK_TIME = int(os.environ.get("WORKER_BLOCK_TIME", 1000))
+    # Upper bound on how long a stopping worker stays blocked in XREADGROUP
+    WORKER_BLOCK_TIME = int(os.environ.get("WORKER_BLOCK_TIME", 500))
+    WORKER_BATCH_SIZE = int(os.environ.get("WORKER_BATCH_SIZE", 16))
+    WORKER_BATCH_BYTES = int(os.environ.get("WORKER_BATCH_BYTES", 1024 * 1024))
+    WORKER_CONCURRENCY = int(os.environ.get("WORKER_CONCURRENCY", 1))
+    WORKER_READ_AHEAD = os.environ.get("WORKER_READ_AHEAD", "false").lower() == "true"
+    WORKER_SUCCESS_LOG_EVERY = int(os.environ.get("WORKER_SUCCESS_LOG_EVERY", 1))
     SESSION_EXPIRE_TIME = int(os.environ.get("SESSION_EXPIRE_TIME", 14400))
     
     # Parallel processing
@@ -81,6 +87,8 @@ class Config:
     ENABLE_MEDICAL_EXTRACTION = os.environ.get("ENABLE_MEDICAL_EXTRACTION", "true").lower() == "true"
     MEDICAL_EXTRACTION_TIMEOUT = int(os.environ.get("MEDICAL_EXTRACTION_TIMEOUT", 60))
     MEDICAL_EXTRACTION_CONFIDENCE_THRESHOLD = float(os.environ.get("MEDICAL_EXTRACTION_CONFIDENCE_THRESHOLD", 0.7))
+    # Transcripts read per XREADGROUP and extracted concurrently (OpenAI calls are I/O bound)
+    MEDICAL_EXTRACTION_BATCH = int(os.environ.get("MEDICAL_EXTRACTION_BATCH", 8))
     
     @classmethod
     def create_directories(cls):
@@ -50,18 +50,19 @@ class AudioHandler:
                 (self.config.MEDICAL_EXTRACTION_STREAM, self.config.MEDICAL_EXTRACTION_CONSUMER_GROUP),
             ]
             
+            # Try to create every consumer group (and stream) in one round-trip
+            pipe = self.redis_client.client.pipeline(transaction=False)
             for stream_name, consumer_group in streams:
-                try:
-                    # Try to create consumer group (will create stream if needed)
-                    self.redis_client.client.xgroup_create(
-                        stream_name, consumer_group, id="$", mkstream=True
-                    )
+                pipe.xgroup_create(stream_name, consumer_group, id="$", mkstream=True)
+            results = pipe.execute(raise_on_error=False)
+            
+            for (stream_name, consumer_group), result in zip(streams, results):
+                if not isinstance(result, Exception):
                     logger.info(f"✅ Created stream {stream_name} with group {consumer_group}")
-                except Exception as e:
-                    if "BUSYGROUP" in str(e):
-                        logger.info(f"✅ Stream {stream_name} already exists")
-                    else:
-                        logger.warning(f"⚠️ Stream creation warning for {stream_name}: {e}")
+                elif "BUSYGROUP" in str(result):
+                    logger.info(f"✅ Stream {stream_name} already exists")
+                else:
+                    logger.warning(f"⚠️ Stream creation warning for {stream_name}: {result}")
                         
         except Exception as e:
             logger.error(f"❌ Error ensuring streams exist: {e}")
@@ -288,11 +289,13 @@ class AudioHandler:
     def _queue_chunks_for_processing(self, session_id, chunks_info):
         """Queue chunks with proper error handling"""
         try:
-            queued_count = 0
             chunk_stream = self.config.AUDIO_CHUNK_STREAM
+            queued_at = datetime.utcnow().isoformat()
+            chunk_entries = []
+            chunk_statuses = []
 
             for chunk_info in chunks_info:
-                chunk_data = {
+                chunk_entries.append({
                     "session_id": session_id,
                     "chunk_id": chunk_info["chunk_id"],
                     "chunk_index": chunk_info["chunk_index"],
@@ -301,32 +304,32 @@ class AudioHandler:
                     "end_time": chunk_info["end_time"],
                     "duration": chunk_info["duration"],
                     "file_size": chunk_info["file_size"],
-                    "queued_at": datetime.utcnow().isoformat(),
+                    "queued_at": queued_at,
                     "type": "chunk_processing",
-                }
-
-                # Add to stream FIRST
-                stream_id = self.redis_client.add_to_stream(chunk_stream, chunk_data)
-
-                # THEN store chunk status
-                chunk_status_key = f"chunk_status:{chunk_info['chunk_id']}"
-                self.redis_client.client.hset(
-                    chunk_status_key,
-                    mapping={
+                })
+                chunk_statuses.append((
+                    f"chunk_status:{chunk_info['chunk_id']}",
+                    {
                         "status": "queued",
-                        "stream_id": stream_id,
                         "session_id": session_id,
-                        "queued_at": datetime.utcnow().isoformat(),
+                        "queued_at": queued_at,
                     },
-                )
-                self.redis_client.client.expire(
-                    chunk_status_key, self.config.SESSION_EXPIRE_TIME
-                )
+                ))
+
+            # Each chunk's status hash, its TTL and the stream entry go out in one
+            # pipelined round-trip for the whole file
+            stream_ids = self.redis_client.add_to_stream_batch(
+                chunk_stream,
+                chunk_entries,
+                status_hashes=chunk_statuses,
+                expire_seconds=self.config.SESSION_EXPIRE_TIME,
+            )
 
-                queued_count += 1
-                logger.debug(f"📤 Chunk {chunk_info['chunk_index']} -> {stream_id}")
+            if logger.isEnabledFor(logging.DEBUG):
+                for chunk_info, stream_id in zip(chunks_info, stream_ids):
+                    logger.debug(f"📤 Chunk {chunk_info['chunk_index']} -> {stream_id}")
 
-            return queued_count
+            return len(stream_ids)
 
         except Exception as e:
             logger.error(f"❌ Error queuing chunks: {e}")
@@ -621,11 +624,12 @@ class AudioHandler:
             cleaned_files = self.chunker.cleanup_chunks(session_id)
 
             # Cleanup chunk status keys
-            chunk_keys = self.redis_client.client.keys(
-                f"chunk_status:{session_id}_chunk_*"
-            )
+            chunk_keys = list(self.redis_client.client.scan_iter(
+                match=f"chunk_status:{session_id}_chunk_*", count=500
+            ))
             if chunk_keys:
-                self.redis_client.client.delete(*chunk_keys)
+                # UNLINK frees the values on a background thread instead of blocking Redis
+                self.redis_client.client.unlink(*chunk_keys)
                 logger.info(f"🧹 Cleaned up {len(chunk_keys)} chunk status keys")
 
             logger.info(
@@ -727,20 +731,16 @@ class AudioHandler:
             consumer_group = self.config.CONSUMER_GROUP
             chunk_consumer_group = self.config.CHUNK_CONSUMER_GROUP
 
+            snapshot = self.redis_client.get_streams_snapshot(
+                {stream_name: consumer_group, chunk_stream_name: chunk_consumer_group}
+            )
+
             stats = {
                 "redis_connected": self.redis_client.ping(),
-                "stream_info": self.redis_client.get_stream_info(stream_name),
-                "chunk_stream_info": self.redis_client.get_stream_info(
-                    chunk_stream_name
-                ),
-                "pending_messages": len(
-                    self.redis_client.get_pending_messages(stream_name, consumer_group)
-                ),
-                "pending_chunks": len(
-                    self.redis_client.get_pending_messages(
-                        chunk_stream_name, chunk_consumer_group
-                    )
-                ),
+                "stream_info": snapshot[stream_name]["info"],
+                "chunk_stream_info": snapshot[chunk_stream_name]["info"],
+                "pending_messages": len(snapshot[stream_name]["pending"]),
+                "pending_chunks": len(snapshot[chunk_stream_name]["pending"]),
                 "upload_folder_size": self._get_folder_size(
                     self.config.UPLOAD_FOLDER
                 ),
@@ -771,22 +771,29 @@ class AudioHandler:
     def _clear_stuck_messages(self):
         """FIXED: Clear any stuck messages in queues"""
         try:
-            # Clear stuck direct processing messages
-            pending = self.redis_client.client.xpending_range(
-                self.config.AUDIO_INPUT_STREAM, self.config.CONSUMER_GROUP, "-", "+", 100
-            )
-            
-            for msg in pending:
-                message_id = msg["message_id"]
-                try:
-                    self.redis_client.client.xack(
-                        self.config.AUDIO_INPUT_STREAM, self.config.CONSUMER_GROUP, message_id
-                    )
-                    logger.info(f"🧹 Cleared stuck message: {message_id}")
-                except:
-                    pass
+            # Clear stuck direct processing messages, paging through the PEL with an
+            # exclusive "(<last id>" start so backlogs over 100 are fully cleared
+            cleared = 0
+            start = "-"
+            while True:
+                pending = self.redis_client.client.xpending_range(
+                    self.config.AUDIO_INPUT_STREAM, self.config.CONSUMER_GROUP, start, "+", 100
+                )
+                if not pending:
+                    break
+                
+                # XACK accepts any number of IDs, so clear each page in one command
+                message_ids = [msg["message_id"] for msg in pending]
+                self.redis_client.client.xack(
+                    self.config.AUDIO_INPUT_STREAM, self.config.CONSUMER_GROUP, *message_ids
+                )
+                cleared += len(message_ids)
+                
+                if len(pending) < 100:
+                    break
+                start = f"({message_ids[-1]}"
                     
-            logger.info(f"🧹 Cleared {len(pending)} stuck messages")
+            logger.info(f"🧹 Cleared {cleared} stuck messages")
         except Exception as e:
             logger.warning(f"⚠️ Error clearing stuck messages: {e}")
 
@@ -943,24 +950,20 @@ class AudioHandler:
                 "streaming_session": "true"
             }
 
-            # Add to chunk processing stream
+            # Store chunk status and add to the chunk processing stream in one
+            # round-trip (status first, so the worker never finds it missing)
             chunk_stream = self.config.AUDIO_CHUNK_STREAM
-            stream_id = self.redis_client.add_to_stream(chunk_stream, chunk_data)
-
-            # Store chunk status
-            chunk_status_key = f"chunk_status:{chunk_data['chunk_id']}"
-            self.redis_client.client.hset(
-                chunk_status_key,
-                mapping={
-                    "status": "queued",
-                    "stream_id": stream_id,
-                    "session_id": session_id,
-                    "chunk_sequence": chunk_sequence,
-                    "queued_at": datetime.utcnow().isoformat(),
-                },
-            )
-            self.redis_client.client.expire(
-                chunk_status_key, self.config.SESSION_EXPIRE_TIME
+            chunk_status = {
+                "status": "queued",
+                "session_id": session_id,
+                "chunk_sequence": chunk_sequence,
+                "queued_at": chunk_data["queued_at"],
+            }
+            stream_id, = self.redis_client.add_to_stream_batch(
+                chunk_stream,
+                [chunk_data],
+                status_hashes=[(f"chunk_status:{chunk_data['chunk_id']}", chunk_status)],
+                expire_seconds=self.config.SESSION_EXPIRE_TIME,
             )
 
             logger.info(f"📤 Queued streaming chunk {chunk_sequence} -> {stream_id}")
@@ -5,16 +5,101 @@ FIXED: Single database connection, no multiple database creation
 """
 
 import os
+import re
 import logging
-from datetime import datetime, timezone
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Optional, Any
-from pymongo import MongoClient, IndexModel, ASCENDING, DESCENDING
-from pymongo.errors import ConnectionFailure, PyMongoError
+import pymongo
+from pymongo import MongoClient, IndexModel, ASCENDING, DESCENDING, UpdateOne, DeleteMany
+from pymongo.collation import Collation
+from pymongo.errors import ConnectionFailure, OperationFailure, PyMongoError
 import json
 from bson import ObjectId
+from bson.codec_options import CodecOptions
+
+# Optional fast JSON codec for the Redis medical data cache
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+# Connection settings are read once at import
+_DATABASE_NAME = os.getenv("MONGODB_DATABASE_NAME", "maichart_medical")
+_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGODB_TIMEOUT_MS", 10000))
+_CONNECT_TIMEOUT_MS = int(os.getenv("MONGODB_CONNECT_TIMEOUT_MS", 10000))
+_SOCKET_TIMEOUT_MS = int(os.getenv("MONGODB_SOCKET_TIMEOUT_MS", 20000))
+_MAX_POOL_SIZE = int(os.getenv("MONGODB_MAX_POOL_SIZE", 50))
+
+# Case-insensitive collation for allergy lookups (index and query must match)
+_CASE_INSENSITIVE = Collation(locale="en", strength=2)
+
+# Severity wording and scores used to bucket chief complaints at ingest
+_HIGH_SEV_RE = re.compile(r"high|severe", re.IGNORECASE)
+_MEDIUM_SEV_RE = re.compile(r"moderate|medium", re.IGNORECASE)
+_LOW_SEV_RE = re.compile(r"mild|low", re.IGNORECASE)
+_SEV_NUM_RE = re.compile(r"\d+")
+
+
+def _normalize_severity(severity: Any):
+    """Parse a free-form severity into (score 0-10 or None, "low"/"medium"/"high" or None)"""
+    if isinstance(severity, bool) or severity is None:
+        return None, None
+    if isinstance(severity, (int, float)):
+        severity_num = int(severity)
+        text = ""
+    else:
+        text = str(severity)
+        match = _SEV_NUM_RE.search(text)
+        severity_num = int(match.group()) if match else None
+    if severity_num is not None and not 0 <= severity_num <= 10:
+        severity_num = None
+    
+    if _HIGH_SEV_RE.search(text) or (severity_num is not None and severity_num >= 8):
+        bucket = "high"
+    elif _MEDIUM_SEV_RE.search(text) or (severity_num is not None and severity_num >= 4):
+        bucket = "medium"
+    elif _LOW_SEV_RE.search(text) or severity_num is not None:
+        bucket = "low"
+    else:
+        bucket = None
+    return severity_num, bucket
+
+
+def _normalize_complaint_details(complaint_details: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Return copies of chief complaint details with severity_num/severity_bucket added"""
+    normalized = []
+    for complaint in complaint_details or []:
+        if not isinstance(complaint, dict):
+            normalized.append(complaint)
+            continue
+        severity_num, severity_bucket = _normalize_severity(complaint.get("severity"))
+        normalized.append({
+            **complaint,
+            "severity_num": severity_num,
+            "severity_bucket": severity_bucket
+        })
+    return normalized
+
+def _cache_dumps(data: Any):
+    """Serialize cached medical data, preferring orjson when installed"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, default=str)
+    return json.dumps(data, default=str)
+
+
+def _cache_loads(raw):
+    """Deserialize cached medical data written by _cache_dumps or json.dumps"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
 class MongoDBClient:
     """
     FIXED MongoDB client - ensures single database usage
@@ -22,9 +107,13 @@ class MongoDBClient:
     
     def __init__(self, connection_string=None, database_name="maichart_medical"):
         self.connection_string = connection_string or os.getenv("MONGODB_CONNECTION_STRING")
-        self.database_name = os.getenv("MONGODB_DATABASE_NAME", "maichart_medical")
+        self.database_name = _DATABASE_NAME
         self.client = None
         self.db = None
+        self.sessions = None
+        self.transcripts = None
+        self.medical_extractions = None
+        self.medical_alerts = None
         
         if not self.connection_string:
             raise ValueError("MongoDB connection string must be provided")
@@ -50,10 +139,10 @@ class MongoDBClient:
             
             self.client = MongoClient(
                 clean_connection_string,
-                serverSelectionTimeoutMS=int(os.getenv("MONGODB_CONNECT_TIMEOUT_MS", 10000)),
-                connectTimeoutMS=int(os.getenv("MONGODB_CONNECT_TIMEOUT_MS", 10000)),
-                socketTimeoutMS=int(os.getenv("MONGODB_SOCKET_TIMEOUT_MS", 20000)),
-                maxPoolSize=int(os.getenv("MONGODB_MAX_POOL_SIZE", 50))
+                serverSelectionTimeoutMS=_SERVER_SELECTION_TIMEOUT_MS,
+                connectTimeoutMS=_CONNECT_TIMEOUT_MS,
+                socketTimeoutMS=_SOCKET_TIMEOUT_MS,
+                maxPoolSize=_MAX_POOL_SIZE
             )
             
             self.client.admin.command('ping')
@@ -61,6 +150,13 @@ class MongoDBClient:
             # Explicitly select database
             self.db = self.client[self.database_name]
             
+            # Decode datetimes as UTC-aware so they compare directly with datetime.now(timezone.utc)
+            codec_options = CodecOptions(tz_aware=True, tzinfo=timezone.utc)
+            self.sessions = self.db.get_collection("sessions", codec_options=codec_options)
+            self.transcripts = self.db.get_collection("transcripts", codec_options=codec_options)
+            self.medical_extractions = self.db.get_collection("medical_extractions", codec_options=codec_options)
+            self.medical_alerts = self.db.get_collection("medical_alerts", codec_options=codec_options)
+            
             logger.info(f"✅ Connected to MongoDB: {self.database_name}")
             
         except ConnectionFailure as e:
@@ -81,11 +177,25 @@ class MongoDBClient:
                 IndexModel([("uploaded_at", DESCENDING)]),
                 IndexModel([("status", ASCENDING)]),
                 IndexModel([("processing_strategy", ASCENDING)]),
-                IndexModel([("uploaded_at", DESCENDING), ("status", ASCENDING)])
+                IndexModel([("uploaded_at", DESCENDING), ("status", ASCENDING)]),
+                IndexModel([("day_bucket", ASCENDING)])
             ]
-            self.db.sessions.create_indexes(sessions_indexes)
+            self.sessions.create_indexes(sessions_indexes)
             logger.info("✅ Sessions collection indexes created")
             
+            # Backfill day_bucket on sessions stored before it existed, so the
+            # recent-sessions count includes them (no-op once all are bucketed)
+            backfill = self.sessions.update_many(
+                {"day_bucket": {"$exists": False}, "_created_at": {"$exists": True}},
+                [{"$set": {"day_bucket": {"$cond": [
+                    {"$eq": [{"$type": "$_created_at"}, "date"]},
+                    {"$dateToString": {"format": "%Y-%m-%d", "date": "$_created_at"}},
+                    {"$substrCP": [{"$toString": "$_created_at"}, 0, 10]}
+                ]}}}]
+            )
+            if backfill.modified_count:
+                logger.info(f"✅ Backfilled day_bucket on {backfill.modified_count} sessions")
+            
             # Transcripts collection indexes
             transcripts_indexes = [
                 IndexModel([("session_id", ASCENDING)], unique=True),
@@ -94,7 +204,7 @@ class MongoDBClient:
                 IndexModel([("word_count", DESCENDING)]),
                 IndexModel([("transcript_text", "text")])  # Full text search
             ]
-            self.db.transcripts.create_indexes(transcripts_indexes)
+            self.transcripts.create_indexes(transcripts_indexes)
             logger.info("✅ Transcripts collection indexes created")
             
             # Medical extractions collection indexes
@@ -104,11 +214,13 @@ class MongoDBClient:
                 IndexModel([("patient_details.name", ASCENDING)]),
                 IndexModel([("patient_details.age", ASCENDING)]),
                 IndexModel([("allergies", ASCENDING)]),
+                IndexModel([("allergies", ASCENDING)], name="allergies_ci", collation=_CASE_INSENSITIVE),
                 IndexModel([("chronic_diseases", ASCENDING)]),
                 IndexModel([("possible_diseases", ASCENDING)]),
-                IndexModel([("extraction_metadata.method", ASCENDING)])
+                IndexModel([("extraction_metadata.method", ASCENDING)]),
+                IndexModel([("chief_complaint_details.severity_num", ASCENDING)])
             ]
-            self.db.medical_extractions.create_indexes(medical_indexes)
+            self.medical_extractions.create_indexes(medical_indexes)
             logger.info("✅ Medical extractions collection indexes created")
             
             # Medical alerts collection indexes
@@ -119,15 +231,27 @@ class MongoDBClient:
                 IndexModel([("alert_type", ASCENDING)]),
                 IndexModel([("session_id", ASCENDING), ("priority", ASCENDING)])
             ]
-            self.db.medical_alerts.create_indexes(alerts_indexes)
+            self.medical_alerts.create_indexes(alerts_indexes)
+            
+            # Alert upserts rely on (session_id, alert_type) being unique; older
+            # data may hold duplicates, which would make the index build fail
+            unique_alert_index = [("session_id", ASCENDING), ("alert_type", ASCENDING)]
+            try:
+                self.medical_alerts.create_index(unique_alert_index, unique=True)
+            except OperationFailure as e:
+                if e.code != 11000:  # DuplicateKey
+                    raise
+                removed = self._remove_duplicate_alerts()
+                logger.warning(f"⚠️ Removed {removed} duplicate medical alerts before creating unique index")
+                self.medical_alerts.create_index(unique_alert_index, unique=True)
             logger.info("✅ Medical alerts collection indexes created")
             
             # Compound indexes for analytics
-            self.db.medical_extractions.create_index([
+            self.medical_extractions.create_index([
                 ("extracted_at", DESCENDING), 
                 ("allergies", ASCENDING)
             ])
-            self.db.medical_extractions.create_index([
+            self.medical_extractions.create_index([
                 ("patient_details.age", ASCENDING), 
                 ("chronic_diseases", ASCENDING)
             ])
@@ -142,6 +266,22 @@ class MongoDBClient:
             logger.error(f"❌ Error setting up MongoDB collections: {e}")
             raise
     
+    def _remove_duplicate_alerts(self) -> int:
+        """Keep only the newest alert per (session_id, alert_type); returns alerts removed"""
+        duplicates = self.medical_alerts.aggregate([
+            {"$sort": {"created_at": -1}},
+            {"$group": {
+                "_id": {"session_id": "$session_id", "alert_type": "$alert_type"},
+                "ids": {"$push": "$_id"},
+                "count": {"$sum": 1}
+            }},
+            {"$match": {"count": {"$gt": 1}}}
+        ], allowDiskUse=True)
+        removed = 0
+        for group in duplicates:
+            removed += self.medical_alerts.delete_many({"_id": {"$in": group["ids"][1:]}}).deleted_count
+        return removed
+    
     def health_check(self) -> bool:
         """Check if MongoDB connection is healthy"""
         try:
@@ -153,10 +293,23 @@ class MongoDBClient:
             logger.error(f"❌ MongoDB health check failed: {e}")
             return False
     
+    def ping_fast(self, timeout: float = 0.2) -> bool:
+        """Ping with a short client-side deadline, for runtime health probes"""
+        try:
+            with pymongo.timeout(timeout):
+                self.client.admin.command('ping')
+            return True
+        except Exception as e:
+            logger.warning(f"⚠️ MongoDB ping failed: {e}")
+            return False
+    
     def close_connection(self):
         """Close MongoDB connection"""
+        global _CLIENT_SINGLETON
         if self.client:
             self.client.close()
+            if _CLIENT_SINGLETON is self:
+                _CLIENT_SINGLETON = None
             logger.info(f"📤 MongoDB connection closed for database: {self.database_name}")
     
     def get_database_info(self) -> Dict[str, Any]:
@@ -194,14 +347,29 @@ class MongoDBClient:
             now = datetime.now(timezone.utc)
             session_data.update({
                 "updated_at": now,
-                "_created_at": session_data.get("_created_at", now),
                 "_database": self.database_name  # FIXED: Track which database
             })
             
-            # Upsert session data
-            result = self.db.sessions.update_one(
+            # FIXED: $set only the caller's fields, so status/extraction fields
+            # mirrored by update_session_status(es) survive a later store; the
+            # creation time is set on insert only, without reading the document
+            created_at = session_data.get("_created_at")
+            creation_fields = {"_created_at": created_at or now}
+            # Day bucket keeps the "recent sessions" count on a small index
+            creation_fields["day_bucket"] = (
+                creation_fields["_created_at"].strftime("%Y-%m-%d")
+                if isinstance(creation_fields["_created_at"], datetime)
+                else str(creation_fields["_created_at"])[:10]
+            )
+            update = {"$set": session_data}
+            if created_at is None:
+                update["$setOnInsert"] = creation_fields
+            else:
+                session_data.update(creation_fields)
+            
+            result = self.sessions.update_one(
                 {"session_id": session_id},
-                {"$set": session_data},
+                update,
                 upsert=True
             )
             
@@ -216,7 +384,7 @@ class MongoDBClient:
     def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
         """Retrieve session data by ID from the correct database"""
         try:
-            session = self.db.sessions.find_one(
+            session = self.sessions.find_one(
                 {"session_id": session_id},
                 {"_id": 0}  # Exclude MongoDB ObjectId
             )
@@ -235,7 +403,7 @@ class MongoDBClient:
                 "_database": self.database_name
             })
             
-            result = self.db.sessions.update_one(
+            result = self.sessions.update_one(
                 {"session_id": session_id},
                 {"$set": updates}
             )
@@ -251,6 +419,31 @@ class MongoDBClient:
             logger.error(f"❌ Error updating session {session_id}: {e}")
             return False
     
+    def update_session_statuses(self, updates: List[tuple]) -> Optional[int]:
+        """Apply several (session_id, updates) pairs with one bulk_write
+
+        Returns the number of sessions matched, or None if the write failed.
+        """
+        if not updates:
+            return 0
+        try:
+            now = datetime.now(timezone.utc)
+            operations = [
+                UpdateOne(
+                    {"session_id": session_id},
+                    {"$set": {**fields, "updated_at": now, "_database": self.database_name}}
+                )
+                for session_id, fields in updates
+            ]
+            # Ordered, so successive updates of one session land in sequence
+            result = self.sessions.bulk_write(operations, ordered=True)
+            logger.debug(f"✅ {len(operations)} session updates applied in {self.database_name}")
+            return result.matched_count
+            
+        except Exception as e:
+            logger.error(f"❌ Error applying {len(updates)} session updates: {e}")
+            return None
+    
     # ==========================================
     # MEDICAL EXTRACTION MANAGEMENT - FIXED
     # ==========================================
@@ -276,12 +469,21 @@ class MongoDBClient:
                 "extraction_metadata"
             ]
             
+            # Parse complaint severities once here rather than on every alert pass
+            if "chief_complaint_details" in medical_data:
+                medical_data = {
+                    **medical_data,
+                    "chief_complaint_details": _normalize_complaint_details(
+                        medical_data["chief_complaint_details"]
+                    )
+                }
+            
             for field in medical_fields:
                 if field in medical_data:
                     medical_doc[field] = medical_data[field]
             
             # Store in MongoDB
-            result = self.db.medical_extractions.update_one(
+            result = self.medical_extractions.update_one(
                 {"session_id": session_id},
                 {"$set": medical_doc},
                 upsert=True
@@ -302,7 +504,7 @@ class MongoDBClient:
     def get_medical_extraction(self, session_id: str) -> Optional[Dict[str, Any]]:
         """Retrieve medical extraction by session ID from correct database"""
         try:
-            medical_data = self.db.medical_extractions.find_one(
+            medical_data = self.medical_extractions.find_one(
                 {"session_id": session_id},
                 {"_id": 0}
             )
@@ -313,6 +515,17 @@ class MongoDBClient:
             logger.error(f"❌ Error retrieving medical extraction for {session_id}: {e}")
             return None
     
+    def get_medical_extraction_clean(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Retrieve medical extraction without MongoDB bookkeeping fields"""
+        try:
+            return self.medical_extractions.find_one(
+                {"session_id": session_id},
+                {"_id": 0, "extracted_at": 0, "updated_at": 0, "session_id": 0, "_database": 0}
+            )
+        except Exception as e:
+            logger.error(f"❌ Error retrieving medical extraction for {session_id}: {e}")
+            return None
+    
     def _generate_and_store_alerts(self, session_id: str, medical_data: Dict[str, Any]):
         """Generate and store medical alerts in the correct database"""
         try:
@@ -336,13 +549,10 @@ class MongoDBClient:
             
             # High severity symptoms
             complaint_details = medical_data.get("chief_complaint_details", [])
-            high_severity_complaints = []
-            for complaint in complaint_details:
-                severity = complaint.get("severity", "")
-                if isinstance(severity, str) and ("high" in severity.lower() or 
-                    any(num in severity for num in ["8", "9", "10"]) or
-                    "severe" in severity.lower()):
-                    high_severity_complaints.append(complaint)
+            high_severity_complaints = [
+                c for c in complaint_details
+                if c.get("severity_bucket") == "high" or (c.get("severity_num") or 0) >= 8
+            ]
             
             if high_severity_complaints:
                 alerts.append({
@@ -372,13 +582,27 @@ class MongoDBClient:
                     "_database": self.database_name
                 })
             
-            # Store alerts if any were generated
+            # Upsert each alert by (session_id, alert_type) so unchanged alerts
+            # are no-op writes, then drop alert types that no longer apply
+            operations = []
+            for alert in alerts:
+                created_at = alert.pop("created_at")
+                operations.append(UpdateOne(
+                    {"session_id": session_id, "alert_type": alert["alert_type"]},
+                    {"$set": alert, "$setOnInsert": {"created_at": created_at}},
+                    upsert=True
+                ))
+            operations.append(DeleteMany({
+                "session_id": session_id,
+                "alert_type": {"$nin": [alert["alert_type"] for alert in alerts]}
+            }))
+            # Alerts are independent and have no schema validator, so let the
+            # server apply them unordered and skip validation
+            self.medical_alerts.bulk_write(
+                operations, ordered=False, bypass_document_validation=True
+            )
+            
             if alerts:
-                # First delete existing alerts for this session
-                self.db.medical_alerts.delete_many({"session_id": session_id})
-                
-                # Insert new alerts
-                self.db.medical_alerts.insert_many(alerts)
                 logger.info(f"✅ Generated {len(alerts)} medical alerts in {self.database_name} for {session_id}")
             
         except Exception as e:
@@ -387,17 +611,22 @@ class MongoDBClient:
     def get_medical_alerts(self, session_id: str) -> List[Dict[str, Any]]:
         """Get medical alerts for a session from correct database"""
         try:
-            alerts = list(self.db.medical_alerts.find(
-                {"session_id": session_id},
-                {"_id": 0}
-            ).sort("created_at", DESCENDING))
-            
-            # Add priority ordering for sorting
-            priority_map = {"critical": 1, "high": 2, "medium": 3, "low": 4}
-            for alert in alerts:
-                alert["priority_order"] = priority_map.get(alert.get("priority", "medium"), 3)
-            
-            return sorted(alerts, key=lambda x: x["priority_order"])
+            # Order by priority server-side (critical first, unknown treated as medium)
+            pipeline = [
+                {"$match": {"session_id": session_id}},
+                {"$addFields": {"_po": {"$switch": {
+                    "branches": [
+                        {"case": {"$eq": ["$priority", "critical"]}, "then": 1},
+                        {"case": {"$eq": ["$priority", "high"]}, "then": 2},
+                        {"case": {"$eq": ["$priority", "low"]}, "then": 4}
+                    ],
+                    "default": 3
+                }}}},
+                {"$sort": {"_po": 1, "created_at": -1}},
+                {"$project": {"_id": 0, "_po": 0}}
+            ]
+
+            return list(self.medical_alerts.aggregate(pipeline))
         except Exception as e:
             logger.error(f"❌ Error retrieving alerts for {session_id}: {e}")
             return []
@@ -411,66 +640,16 @@ class MongoDBClient:
         try:
             stats = {"database_name": self.database_name}
             
-            # Total counts
-            stats["total_sessions"] = self.db.sessions.count_documents({})
-            stats["total_transcripts"] = self.db.transcripts.count_documents({})
-            stats["total_medical_extractions"] = self.db.medical_extractions.count_documents({})
-            stats["total_alerts"] = self.db.medical_alerts.count_documents({})
-            
-            # Status distribution
-            status_pipeline = [
-                {"$group": {"_id": "$status", "count": {"$sum": 1}}},
-                {"$sort": {"count": -1}}
-            ]
-            status_dist = list(self.db.sessions.aggregate(status_pipeline))
-            stats["status_distribution"] = {item["_id"]: item["count"] for item in status_dist}
-            
-            # Alert priority distribution
-            alert_pipeline = [
-                {"$group": {"_id": "$priority", "count": {"$sum": 1}}},
-                {"$sort": {"count": -1}}
-            ]
-            alert_dist = list(self.db.medical_alerts.aggregate(alert_pipeline))
-            stats["alert_distribution"] = {item["_id"]: item["count"] for item in alert_dist}
-            
-            # Most common conditions
-            conditions_pipeline = [
-                {"$unwind": "$possible_diseases"},
-                {"$group": {"_id": "$possible_diseases", "count": {"$sum": 1}}},
-                {"$sort": {"count": -1}},
-                {"$limit": 10}
-            ]
-            common_conditions = list(self.db.medical_extractions.aggregate(conditions_pipeline))
-            stats["common_conditions"] = {item["_id"]: item["count"] for item in common_conditions}
-            
-            # Most common medications
-            medications_pipeline = [
-                {"$unwind": "$drug_history"},
-                {"$group": {"_id": "$drug_history", "count": {"$sum": 1}}},
-                {"$sort": {"count": -1}},
-                {"$limit": 10}
-            ]
-            common_meds = list(self.db.medical_extractions.aggregate(medications_pipeline))
-            stats["common_medications"] = {item["_id"]: item["count"] for item in common_meds}
-            
-            # Patients with allergies count
-            stats["patients_with_allergies"] = self.db.medical_extractions.count_documents({
-                "allergies": {"$exists": True, "$not": {"$size": 0}}
-            })
-            
-            # Recent activity (last 7 days)
-            from datetime import timedelta
-            week_ago = datetime.now(timezone.utc) - timedelta(days=7)
-            stats["recent_sessions"] = self.db.sessions.count_documents({
-                "uploaded_at": {"$gte": week_ago}
-            })
-            
-            # Average confidence score
-            confidence_pipeline = [
-                {"$group": {"_id": None, "avg_confidence": {"$avg": "$confidence"}}}
-            ]
-            avg_conf = list(self.db.transcripts.aggregate(confidence_pipeline))
-            stats["average_confidence"] = round(avg_conf[0]["avg_confidence"], 3) if avg_conf else 0
+            # Each collection is queried independently, so overlap the round-trips
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                futures = [
+                    executor.submit(self._session_statistics),
+                    executor.submit(self._transcript_statistics),
+                    executor.submit(self._medical_extraction_statistics),
+                    executor.submit(self._alert_statistics)
+                ]
+                for future in futures:
+                    stats.update(future.result())
             
             logger.info(f"📊 Generated statistics for database: {self.database_name}")
             return stats
@@ -479,6 +658,82 @@ class MongoDBClient:
             logger.error(f"❌ Error getting medical statistics: {e}")
             return {"database_name": self.database_name, "error": str(e)}
     
+    def _session_statistics(self) -> Dict[str, Any]:
+        """Session totals, status distribution and recent activity"""
+        stats = {"total_sessions": self.sessions.count_documents({})}
+        
+        # Status distribution
+        status_pipeline = [
+            {"$group": {"_id": "$status", "count": {"$sum": 1}}},
+            {"$sort": {"count": -1}}
+        ]
+        stats["status_distribution"] = {
+            item["_id"]: item["count"] for item in self.sessions.aggregate(status_pipeline)
+        }
+        
+        # Recent activity (last 7 days)
+        week_ago = datetime.now(timezone.utc) - timedelta(days=7)
+        stats["recent_sessions"] = self.sessions.count_documents({
+            "day_bucket": {"$gte": week_ago.strftime("%Y-%m-%d")}
+        })
+        return stats
+    
+    def _transcript_statistics(self) -> Dict[str, Any]:
+        """Transcript totals and average confidence score"""
+        stats = {"total_transcripts": self.transcripts.count_documents({})}
+        
+        confidence_pipeline = [
+            {"$group": {"_id": None, "avg_confidence": {"$avg": "$confidence"}}}
+        ]
+        avg_conf = next(self.transcripts.aggregate(confidence_pipeline), None)
+        stats["average_confidence"] = round(avg_conf["avg_confidence"], 3) if avg_conf else 0
+        return stats
+    
+    def _medical_extraction_statistics(self) -> Dict[str, Any]:
+        """Extraction totals, common conditions/medications and allergy count"""
+        stats = {"total_medical_extractions": self.medical_extractions.count_documents({})}
+        
+        # Most common conditions
+        conditions_pipeline = [
+            {"$unwind": "$possible_diseases"},
+            {"$group": {"_id": "$possible_diseases", "count": {"$sum": 1}}},
+            {"$sort": {"count": -1}},
+            {"$limit": 10}
+        ]
+        stats["common_conditions"] = {
+            item["_id"]: item["count"] for item in self.medical_extractions.aggregate(conditions_pipeline)
+        }
+        
+        # Most common medications
+        medications_pipeline = [
+            {"$unwind": "$drug_history"},
+            {"$group": {"_id": "$drug_history", "count": {"$sum": 1}}},
+            {"$sort": {"count": -1}},
+            {"$limit": 10}
+        ]
+        stats["common_medications"] = {
+            item["_id"]: item["count"] for item in self.medical_extractions.aggregate(medications_pipeline)
+        }
+        
+        # Patients with allergies count
+        stats["patients_with_allergies"] = self.medical_extractions.count_documents({
+            "allergies": {"$exists": True, "$not": {"$size": 0}}
+        })
+        return stats
+    
+    def _alert_statistics(self) -> Dict[str, Any]:
+        """Alert totals and priority distribution"""
+        stats = {"total_alerts": self.medical_alerts.count_documents({})}
+        
+        alert_pipeline = [
+            {"$group": {"_id": "$priority", "count": {"$sum": 1}}},
+            {"$sort": {"count": -1}}
+        ]
+        stats["alert_distribution"] = {
+            item["_id"]: item["count"] for item in self.medical_alerts.aggregate(alert_pipeline)
+        }
+        return stats
+    
     def search_patients_by_condition(self, condition: str, limit: int = 20) -> List[Dict[str, Any]]:
         """Search patients by medical condition in correct database"""
         try:
@@ -490,55 +745,80 @@ class MongoDBClient:
                 ]
             }
             
-            results = list(self.db.medical_extractions.find(
+            cursor = self.medical_extractions.find(
                 query,
                 {"_id": 0}
-            ).limit(limit))
+            ).batch_size(200).limit(limit)
             
-            return results
+            return list(cursor)
         except Exception as e:
             logger.error(f"❌ Error searching patients by condition {condition}: {e}")
             return []
     
-    def get_patients_with_allergies(self, allergy: str = None) -> List[Dict[str, Any]]:
-        """Get patients with specific allergy or all patients with allergies from correct database"""
+    def get_patients_with_allergies(self, allergy: str = None, limit: int = 100) -> List[Dict[str, Any]]:
+        """Get patients with an allergy starting with `allergy` (case-insensitive), or all with allergies
+
+        "penicillin" matches "Penicillin (rash)"; matches inside the text do not count.
+        """
         try:
+            projection = {"_id": 0, "session_id": 1, "patient_details": 1, "allergies": 1, "extracted_at": 1}
             if allergy:
-                query = {"allergies": {"$regex": allergy, "$options": "i"}}
+                # FIXED: case-insensitive prefix match as a collated range, so it gets
+                # tight bounds on the allergies_ci index (a /i regex can't). U+FFFF
+                # sorts after every character; $elemMatch keeps both bounds on one entry
+                cursor = self.medical_extractions.find(
+                    {"allergies": {"$elemMatch": {"$gte": allergy, "$lt": allergy + "\uffff"}}},
+                    projection, collation=_CASE_INSENSITIVE
+                )
             else:
-                query = {"allergies": {"$exists": True, "$not": {"$size": 0}}}
+                cursor = self.medical_extractions.find(
+                    {"allergies": {"$exists": True, "$not": {"$size": 0}}}, projection
+                )
             
-            results = list(self.db.medical_extractions.find(
-                query,
-                {"_id": 0, "session_id": 1, "patient_details": 1, "allergies": 1, "extracted_at": 1}
-            ).sort("extracted_at", DESCENDING))
+            cursor = cursor.sort("extracted_at", DESCENDING).batch_size(200).limit(limit)
             
-            return results
+            return list(cursor)
         except Exception as e:
             logger.error(f"❌ Error retrieving patients with allergies: {e}")
             return []
 
 
 # FIXED: Factory function with proper database name handling
-def get_mongodb_client() -> MongoDBClient:
-    """Factory function to create MongoDB client instance with consistent database name"""
-    try:
-        # FIXED: Always use the same database name from environment
-        database_name = os.getenv("MONGODB_DATABASE_NAME", "maichart_medical")
-        connection_string = os.getenv("MONGODB_CONNECTION_STRING")
-        
-        if not connection_string:
-            raise ValueError("MONGODB_CONNECTION_STRING environment variable is required")
-        
-        client = MongoDBClient(
-            connection_string=connection_string,
-            database_name=database_name
-        )
-        logger.info(f"✅ Created MongoDB client for database: {database_name}")
-        return client
-    except Exception as e:
-        logger.error(f"❌ Failed to create MongoDB client: {e}")
-        raise
+_CLIENT_SINGLETON: Optional[MongoDBClient] = None
+_CLIENT_LOCK = threading.Lock()
+
+
+def get_mongodb_client(connection_string: Optional[str] = None,
+                       database_name: Optional[str] = None) -> MongoDBClient:
+    """Return the process-wide MongoDB client, creating it on first use
+
+    The arguments (defaulting to the environment) only apply when the client is
+    created; the API lifespan and the extraction worker both come through here.
+    """
+    global _CLIENT_SINGLETON
+    if _CLIENT_SINGLETON is not None:
+        return _CLIENT_SINGLETON
+    
+    with _CLIENT_LOCK:
+        if _CLIENT_SINGLETON is not None:
+            return _CLIENT_SINGLETON
+        try:
+            # FIXED: Always use the same database name from environment
+            database_name = database_name or _DATABASE_NAME
+            connection_string = connection_string or os.getenv("MONGODB_CONNECTION_STRING")
+            
+            if not connection_string:
+                raise ValueError("MONGODB_CONNECTION_STRING environment variable is required")
+            
+            _CLIENT_SINGLETON = MongoDBClient(
+                connection_string=connection_string,
+                database_name=database_name
+            )
+            logger.info(f"✅ Created MongoDB client for database: {database_name}")
+            return _CLIENT_SINGLETON
+        except Exception as e:
+            logger.error(f"❌ Failed to create MongoDB client: {e}")
+            raise
 
 
 # FIXED: Integration with existing Redis client
@@ -548,9 +828,10 @@ class HybridStorageClient:
     and MongoDB (for persistent storage) - ensures single database usage
     """
     
-    def __init__(self, redis_client, mongodb_client):
+    def __init__(self, redis_client, mongodb_client, cache_expire_seconds: int = 3600):
         self.redis_client = redis_client
         self.mongodb_client = mongodb_client
+        self.cache_expire_seconds = cache_expire_seconds
         
         # FIXED: Log which database we're using
         db_info = self.mongodb_client.get_database_info()
@@ -571,7 +852,7 @@ class HybridStorageClient:
         self.redis_client.client.hset(
             medical_data_key,
             mapping={
-                "medical_data": json.dumps(medical_data),
+                "medical_data": _cache_dumps(medical_data),
                 "extracted_at": datetime.now(timezone.utc).isoformat(),
                 "session_id": session_id
             }
@@ -595,20 +876,35 @@ class HybridStorageClient:
         # Try Redis first
         try:
             medical_data_key = f"medical_data:{session_id}"
-            data = self.redis_client.client.hgetall(medical_data_key)
-            if data and data.get("medical_data"):
-                return json.loads(data["medical_data"])
+            data = self.redis_client.client.hget(medical_data_key, "medical_data")
+            if data:
+                return _cache_loads(data)
         except Exception:
             pass
         
         # Fallback to MongoDB
-        mongo_data = self.mongodb_client.get_medical_extraction(session_id)
+        # MongoDB-specific fields are excluded server-side for compatibility
+        mongo_data = self.mongodb_client.get_medical_extraction_clean(session_id)
         if mongo_data and isinstance(mongo_data, dict):
-            # Remove MongoDB-specific fields for compatibility
-            mongo_data.pop("extracted_at", None)
-            mongo_data.pop("updated_at", None)
-            mongo_data.pop("session_id", None)
-            mongo_data.pop("_database", None)  # FIXED: Remove database tracking field
+            self._backfill_medical_data(session_id, mongo_data)
             return mongo_data
         
-        return None
\ No newline at end of file
+        return None
+
+    def _backfill_medical_data(self, session_id: str, medical_data: Dict[str, Any]):
+        """Repopulate the Redis cache after a MongoDB hit so later reads stay in Redis"""
+        try:
+            medical_data_key = f"medical_data:{session_id}"
+            pipe = self.redis_client.client.pipeline(transaction=False)
+            pipe.hset(
+                medical_data_key,
+                mapping={
+                    "medical_data": _cache_dumps(medical_data),
+                    "extracted_at": datetime.now(timezone.utc).isoformat(),
+                    "session_id": session_id
+                }
+            )
+            pipe.expire(medical_data_key, self.cache_expire_seconds)
+            pipe.execute()
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to backfill Redis medical data for {session_id}: {e}")
\ No newline at end of file
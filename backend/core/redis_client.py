@@ -1,10 +1,206 @@
+import os
+import socket
 import redis
 import json
+import time
 import logging
-from typing import Dict, Any, Optional
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
+from redis.backoff import EqualJitterBackoff
+from redis.retry import Retry
+
+# Optional fast JSON codec for values stored in hashes and streams
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on sockets per pool; every RedisClient in the process with the
+# same connection settings shares one pool
+REDIS_POOL_SIZE = int(os.getenv("REDIS_POOL_SIZE", "50"))
+
+# Seconds a caller waits for a free pooled socket once REDIS_POOL_SIZE is reached
+REDIS_POOL_TIMEOUT = float(os.getenv("REDIS_POOL_TIMEOUT", "5"))
+
+# Connect/command retries on connection errors, with jittered exponential backoff
+REDIS_RETRIES = int(os.getenv("REDIS_RETRIES", "3"))
+
+# Seconds a command may wait on a socket read; blocking XREADGROUP calls must
+# stay below this or the client times out before Redis answers
+REDIS_SOCKET_TIMEOUT = 10
+
+# Socket send/receive buffer size, sized for multi-message XREADGROUP/XPENDING replies
+REDIS_SOCKET_BUFFER_BYTES = int(os.getenv("REDIS_SOCKET_BUFFER_BYTES", str(512 * 1024)))
+
+
+class _SocketBufferMixin:
+    """Raise SO_RCVBUF/SO_SNDBUF on each new connection so bulk replies need fewer recv() calls"""
+
+    def _connect(self):
+        sock = super()._connect()
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, REDIS_SOCKET_BUFFER_BYTES)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, REDIS_SOCKET_BUFFER_BYTES)
+        except OSError as e:
+            logger.debug(f"Could not resize Redis socket buffers: {e}")
+        return sock
+
+
+class BufferedConnection(_SocketBufferMixin, redis.Connection):
+    pass
+
+
+class BufferedSSLConnection(_SocketBufferMixin, redis.SSLConnection):
+    pass
+
+
+_POOLS: Dict[tuple, redis.ConnectionPool] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def get_connection_pool(**connection_kwargs) -> redis.ConnectionPool:
+    """Return the shared connection pool for these connection settings"""
+    key = tuple(sorted(connection_kwargs.items()))
+    with _POOLS_LOCK:
+        pool = _POOLS.get(key)
+        if pool is None:
+            pool_kwargs = dict(connection_kwargs)
+            if pool_kwargs.pop('ssl', False):
+                pool_kwargs['connection_class'] = BufferedSSLConnection
+            else:
+                pool_kwargs['connection_class'] = BufferedConnection
+            # Blocking pool: callers queue for a socket instead of failing
+            # with "Too many connections" when the cap is reached
+            pool = redis.BlockingConnectionPool(
+                max_connections=REDIS_POOL_SIZE,
+                timeout=REDIS_POOL_TIMEOUT,
+                health_check_interval=30,
+                # Jitter keeps a fleet of workers from reconnecting in lockstep
+                retry=Retry(EqualJitterBackoff(cap=10, base=0.1), REDIS_RETRIES),
+                retry_on_error=[redis.ConnectionError],
+                **pool_kwargs
+            )
+            _POOLS[key] = pool
+        return pool
+
+
+# First characters of values that may be JSON; anything else is kept as a plain
+# string without paying for a failed decode
+_JSON_START_BYTES = frozenset(b'{["-0123456789tfn')
+
+# How long a parsed session status may be served from the in-process cache
+STATUS_CACHE_TTL = 0.2
+
+# Upper bound on cached session statuses; the cache is shared by every
+# RedisClient in the process, so per-request clients still get hits
+STATUS_CACHE_MAX_ENTRIES = 1024
+
+_STATUS_CACHE: "OrderedDict[str, tuple]" = OrderedDict()
+_STATUS_CACHE_LOCK = threading.Lock()
+
+
+def _status_cache_get(session_id: str) -> Optional[Dict[str, Any]]:
+    """Cached parsed status for session_id, or None if missing or expired"""
+    cached = _STATUS_CACHE.get(session_id)
+    if cached and time.monotonic() - cached[0] < STATUS_CACHE_TTL:
+        return cached[1]
+    return None
+
+
+def _status_cache_put(session_id: str, result: Dict[str, Any]):
+    """Cache a parsed status, evicting expired entries and the oldest past the size cap"""
+    now = time.monotonic()
+    with _STATUS_CACHE_LOCK:
+        _STATUS_CACHE.pop(session_id, None)
+        _STATUS_CACHE[session_id] = (now, result)
+        # Insertion order is age order, so expired entries sit at the front
+        while _STATUS_CACHE:
+            oldest_at = next(iter(_STATUS_CACHE.values()))[0]
+            if now - oldest_at < STATUS_CACHE_TTL and len(_STATUS_CACHE) <= STATUS_CACHE_MAX_ENTRIES:
+                break
+            _STATUS_CACHE.popitem(last=False)
+
+
+def _status_cache_invalidate(session_id: str):
+    """Drop a session's cached status after a write"""
+    with _STATUS_CACHE_LOCK:
+        _STATUS_CACHE.pop(session_id, None)
+
+# Default XREADGROUP prefetch and the matching ack batch size for consumers
+STREAM_PREFETCH = int(os.getenv("REDIS_STREAM_PREFETCH", "32"))
+ACK_BATCH_SIZE = int(os.getenv("REDIS_ACK_BATCH_SIZE", str(STREAM_PREFETCH)))
+
+# HSET + EXPIRE as one server-side command: KEYS[1] = status key,
+# ARGV[1] = TTL in seconds, ARGV[2..] = field/value pairs
+_SET_STATUS_LUA = """
+redis.call('HSET', KEYS[1], unpack(ARGV, 2))
+return redis.call('EXPIRE', KEYS[1], ARGV[1])
+"""
+
+
+def _connect_reply_off(connection):
+    """redis_connect_func for the status channel: handshake, then CLIENT REPLY OFF
+
+    OFF never answers when it works, so it is followed by ON (which does) to
+    confirm it: a rejected OFF raises ResponseError here instead of leaving an
+    unread error reply that would desync every later read on the connection.
+    """
+    connection.on_connect()
+    connection.send_packed_command(connection.pack_commands([
+        ("CLIENT", "REPLY", "OFF"),
+        ("CLIENT", "REPLY", "ON"),
+    ]))
+    connection.read_response()  # OK from ON, or the error from a rejected OFF
+    connection.send_command("CLIENT", "REPLY", "OFF")
+
+
+def _json_dumps(value: Any):
+    """Encode a dict/list value for Redis (bytes with orjson, str otherwise)"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(value)
+
+
+def _json_loads(raw):
+    """Decode a JSON value read back from Redis"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _encode_value(value: Any):
+    """Slow path for types missing from _FIELD_ENCODERS (subclasses, None, ...)"""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (dict, list)):
+        return _json_dumps(value)
+    return str(value)
+
+
+# Exact-type dispatch for the common field types, skipping isinstance checks
+_FIELD_ENCODERS = {
+    str: lambda value: value,
+    dict: _json_dumps,
+    list: _json_dumps,
+    int: str,
+    float: str,
+    bool: str,
+}
+
+
+def _encode_stream_fields(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert complex values to JSON and everything else to str"""
+    get_encoder = _FIELD_ENCODERS.get
+    return {
+        key: get_encoder(type(value), _encode_value)(value)
+        for key, value in data.items()
+    }
+
 
 class RedisClient:
     def __init__(
@@ -15,6 +211,13 @@ class RedisClient:
         self.port = port
         self.password = password
         self.db = db
+        self.prefetch = STREAM_PREFETCH
+        self._groups_created: set = set()
+        self._status_conn = None
+        self._status_reply_off = True  # cleared if the server rejects CLIENT REPLY OFF
+        self._status_conn_used_at = 0.0
+        self._status_conn_lock = threading.Lock()
+        self.ack_batch_size = ACK_BATCH_SIZE
 
         try:
             # Redis Cloud connection with proper SSL and authentication
@@ -24,7 +227,8 @@ class RedisClient:
                 'db': db,
                 'decode_responses': decode_responses,
                 'socket_connect_timeout': 10,
-                'socket_timeout': 10,
+                'socket_timeout': REDIS_SOCKET_TIMEOUT,
+                'socket_keepalive': True,
             }
             
             # Add password if provided
@@ -34,7 +238,7 @@ class RedisClient:
             # Redis Cloud typically uses SSL, but check if SSL is needed
             # For now, we'll try without SSL first, then with SSL if connection fails
             try:
-                self.client = redis.Redis(**connection_kwargs)
+                self.client = redis.Redis(connection_pool=get_connection_pool(**connection_kwargs))
                 # Test connection
                 self.client.ping()
                 logger.info(f"Connected to Redis Cloud at {host}:{port} (no SSL)")
@@ -42,11 +246,20 @@ class RedisClient:
                 # Try with SSL if first attempt fails
                 connection_kwargs['ssl'] = True
                 connection_kwargs['ssl_cert_reqs'] = None
-                self.client = redis.Redis(**connection_kwargs)
+                self.client = redis.Redis(connection_pool=get_connection_pool(**connection_kwargs))
                 # Test connection
                 self.client.ping()
                 logger.info(f"Connected to Redis Cloud at {host}:{port} (with SSL)")
 
+            # Loaded lazily via EVALSHA, falling back to EVAL on NOSCRIPT
+            self._set_status_script = self.client.register_script(_SET_STATUS_LUA)
+
+            # Byte-level client for reads whose values go straight to the JSON parser,
+            # so they are not UTF-8 decoded by redis-py first
+            self._raw_client = redis.Redis(
+                connection_pool=get_connection_pool(**{**connection_kwargs, 'decode_responses': False})
+            )
+
         except redis.ConnectionError as e:
             logger.error(f"Failed to connect to Redis Cloud: {e}")
             raise
@@ -63,16 +276,12 @@ class RedisClient:
         """Add data to Redis stream"""
         try:
             # Convert complex data to JSON strings
-            stream_data = {}
-            for key, value in data.items():
-                if isinstance(value, (dict, list)):
-                    stream_data[key] = json.dumps(value)
-                else:
-                    stream_data[key] = str(value)
+            stream_data = _encode_stream_fields(data)
 
             # Add to stream
             stream_id = self.client.xadd(stream_name, stream_data)
-            logger.info(f"Added to stream {stream_name}: {stream_id}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Added to stream %s: %s", stream_name, stream_id)
 
             return stream_id
 
@@ -80,16 +289,79 @@ class RedisClient:
             logger.error(f"Error adding to stream {stream_name}: {e}")
             raise
 
-    def read_stream(self, stream_name: str, consumer_group: str, consumer_name: str, count: int = 1, block: int = 1000) -> list:
-        """FIXED: Simple and reliable Redis stream reading"""
+    def add_to_stream_batch(
+        self,
+        stream_name: str,
+        items: List[Dict[str, Any]],
+        status_hashes: Optional[List[Tuple[str, Dict[str, Any]]]] = None,
+        expire_seconds: Optional[int] = None,
+    ) -> list:
+        """Add several entries to a Redis stream in one pipelined round-trip
+
+        status_hashes, if given, holds one (key, mapping) per item; each hash is
+        written (and given expire_seconds) just before its entry is added, so a
+        consumer never sees an entry whose status hash doesn't exist yet.
+        """
+        if not items:
+            return []
         try:
-            # Ensure consumer group exists
-            try:
-                self.client.xgroup_create(stream_name, consumer_group, id="0", mkstream=True)
-                logger.info(f"✅ Created consumer group {consumer_group} for stream {stream_name}")
-            except Exception as e:
-                if "BUSYGROUP" not in str(e):
-                    logger.error(f"Error creating consumer group: {e}")
+            pipe = self.client.pipeline(transaction=False)
+            for index, data in enumerate(items):
+                if status_hashes:
+                    status_key, mapping = status_hashes[index]
+                    pipe.hset(status_key, mapping=_encode_stream_fields(mapping))
+                    if expire_seconds:
+                        pipe.expire(status_key, expire_seconds)
+                pipe.xadd(stream_name, _encode_stream_fields(data))
+            results = pipe.execute()
+            # Every item's XADD is the last command of its group
+            group_size = len(results) // len(items)
+            stream_ids = results[group_size - 1::group_size]
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Added %d entries to stream %s", len(stream_ids), stream_name)
+
+            return stream_ids
+
+        except Exception as e:
+            logger.error(f"Error adding batch to stream {stream_name}: {e}")
+            raise
+
+    def add_to_stream_and_ack(
+        self, target_stream: str, data: Dict[str, Any],
+        stream_name: str, consumer_group: str, message_id: str
+    ) -> str:
+        """XADD an entry to target_stream and XACK message_id in one pipelined round-trip"""
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            pipe.xadd(target_stream, _encode_stream_fields(data))
+            pipe.xack(stream_name, consumer_group, message_id)
+            stream_id, _ = pipe.execute()
+            return stream_id
+        except Exception as e:
+            logger.error(f"Error moving {message_id} from {stream_name} to {target_stream}: {e}")
+            raise
+
+    def mark_group_created(self, stream_name: str, consumer_group: str):
+        """Record that a consumer group exists so read_stream skips XGROUP CREATE"""
+        self._groups_created.add((stream_name, consumer_group))
+
+    def read_stream(self, stream_name: str, consumer_group: str, consumer_name: str, count: Optional[int] = None, block: int = 1000) -> list:
+        """FIXED: Simple and reliable Redis stream reading (count defaults to self.prefetch)"""
+        if count is None:
+            count = self.prefetch
+        group_key = (stream_name, consumer_group)
+        try:
+            # Ensure consumer group exists (once per stream/group on this client)
+            if group_key not in self._groups_created:
+                try:
+                    self.client.xgroup_create(stream_name, consumer_group, id="0", mkstream=True)
+                    logger.info(f"✅ Created consumer group {consumer_group} for stream {stream_name}")
+                    self._groups_created.add(group_key)
+                except Exception as e:
+                    if "BUSYGROUP" in str(e):
+                        self._groups_created.add(group_key)
+                    else:
+                        logger.error(f"Error creating consumer group: {e}")
             
             # SIMPLE FIX: Just read new messages using ">"
             result = self.client.xreadgroup(
@@ -101,10 +373,14 @@ class RedisClient:
             )
             
             if result:
-                logger.info(f"📨 Read {len(result)} messages from {stream_name}")
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info("📨 Read %d messages from %s", len(result), stream_name)
             return result
             
         except Exception as e:
+            if "NOGROUP" in str(e):
+                # Group or stream was removed externally; recreate on the next read
+                self._groups_created.discard(group_key)
             logger.error(f"❌ Error reading from stream {stream_name}: {e}")
             return []
 
@@ -116,16 +392,16 @@ class RedisClient:
             key = f"session_status:{session_id}"
             
             # FIXED: Ensure all values are strings for Redis
-            string_data = {}
-            for k, v in status_data.items():
-                if isinstance(v, (dict, list)):
-                    string_data[k] = json.dumps(v)
-                else:
-                    string_data[k] = str(v)
+            string_data = _encode_stream_fields(status_data)
+            _status_cache_invalidate(session_id)
             
-            self.client.hset(key, mapping=string_data)
-            self.client.expire(key, expire_seconds)
-            logger.debug(f"Set status for session {session_id}")
+            # Write fields and TTL atomically in a single command
+            args = [expire_seconds]
+            for field, value in string_data.items():
+                args.extend((field, value))
+            self._set_status_script(keys=[key], args=args)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Set status for session %s", session_id)
         except Exception as e:
             logger.error(f"Error setting session status: {e}")
             raise
@@ -133,61 +409,182 @@ class RedisClient:
     def get_session_status(self, session_id: str) -> Optional[Dict[str, Any]]:
         """Get session status data - FIXED"""
         try:
+            # Serve repeated polls from a short-lived cache; writes invalidate it
+            cached = _status_cache_get(session_id)
+            if cached is not None:
+                return dict(cached)
+
             key = f"session_status:{session_id}"
-            data = self.client.hgetall(key)
+            data = self._raw_client.hgetall(key)
 
             if not data:
                 return None
 
-            # Convert back from Redis strings
+            # Convert back from raw Redis bytes; JSON-looking values are parsed
+            # directly from bytes, everything else is decoded once to str
             result = {}
             for k, v in data.items():
+                k = k.decode()
                 try:
                     # FIXED: Handle different data types properly
-                    if isinstance(v, str) and v.strip():
-                        # Try to parse as JSON if it's a non-empty string
-                        result[k] = json.loads(v)
-                    elif isinstance(v, str):
-                        # Keep empty strings as strings
-                        result[k] = v
-                    elif isinstance(v, (list, dict)):
-                        # Already parsed, use as-is
-                        result[k] = v
+                    if v and v[0] in _JSON_START_BYTES:
+                        # Try to parse as JSON if it looks like JSON
+                        result[k] = _json_loads(v)
                     else:
-                        # Keep as original type
-                        result[k] = v
+                        # Keep plain/empty strings as-is
+                        result[k] = v.decode()
                 except (json.JSONDecodeError, TypeError):
                     # Keep as string if not JSON
-                    result[k] = v
+                    result[k] = v.decode()
 
-            return result
+            _status_cache_put(session_id, result)
+            return dict(result)
 
         except Exception as e:
             logger.error(f"Error getting session status: {e}")
             return None
 
-    def update_session_status(self, session_id: str, updates: Dict[str, Any]):
-        """Update specific fields in session status"""
+    def update_session_status(self, session_id: str, updates: Dict[str, Any], pipe=None):
+        """Update specific fields in session status (queued on `pipe` if given)"""
         try:
             key = f"session_status:{session_id}"
 
             # Convert values to strings
-            string_updates = {}
-            for k, v in updates.items():
-                if isinstance(v, (dict, list)):
-                    string_updates[k] = json.dumps(v)
-                else:
-                    string_updates[k] = str(v)
-
-            self.client.hset(key, mapping=string_updates)
-            logger.debug(
-                f"Updated status for session {session_id}: {list(updates.keys())}"
-            )
+            string_updates = _encode_stream_fields(updates)
+            _status_cache_invalidate(session_id)
+
+            (pipe or self.client).hset(key, mapping=string_updates)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Updated status for session %s: %s", session_id, list(updates.keys())
+                )
 
         except Exception as e:
             logger.error(f"Error updating session status: {e}")
             raise
 
+    def _status_connection(self):
+        """Dedicated connection kept in CLIENT REPLY OFF mode for write_session_status
+
+        Returns None when the server (or a proxy in front of it) rejects CLIENT
+        REPLY OFF; callers then fall back to ordinary replied commands.
+        """
+        if not self._status_reply_off:
+            return None
+        pool = self.client.connection_pool
+        if self._status_conn is None:
+            kwargs = dict(pool.connection_kwargs)
+            # No replies means no PONG either, so health-check pings would hang
+            kwargs["health_check_interval"] = 0
+            kwargs["redis_connect_func"] = _connect_reply_off
+            self._status_conn = pool.connection_class(**kwargs)
+        # Stand-in for the health check: a socket idle longer than the pool's
+        # interval may already be closed by a proxy, so reconnect before using it
+        idle_limit = pool.connection_kwargs.get("health_check_interval", 0)
+        now = time.monotonic()
+        if idle_limit and now - self._status_conn_used_at > idle_limit:
+            self._status_conn.disconnect()
+        self._status_conn_used_at = now
+        try:
+            self._status_conn.connect()  # no-op while connected
+        except redis.ResponseError as e:
+            # connect() already dropped the socket, so no stray replies survive
+            logger.warning(f"⚠️ CLIENT REPLY OFF rejected ({e}); status writes will wait for replies")
+            self._status_reply_off = False
+            self._status_conn = None
+            return None
+        return self._status_conn
+
+    def write_session_status(self, session_id: str, updates: Dict[str, Any], reply: bool = True):
+        """Update session status fields over a dedicated, ordered connection
+
+        With reply=False the HSET is fire-and-forget: Redis sends nothing back, so
+        progress pings cost no response bytes or parsing. Only use it for
+        progress-only updates; anything that changes "status" needs reply=True,
+        which wraps the write in CLIENT REPLY ON/OFF and awaits its result so
+        failures surface. Both go over the same connection, which keeps a late
+        progress ping from overtaking a status transition. If the server rejects
+        CLIENT REPLY OFF, every write goes through the normal client instead.
+
+        A write that hits a dropped socket is resent once on a fresh connection
+        (HSET is idempotent); if that fails too it goes through the pooled
+        client, whose Retry/backoff this dedicated connection doesn't get.
+        """
+        key = f"session_status:{session_id}"
+        string_updates = _encode_stream_fields(updates)
+        args = []
+        for field, value in string_updates.items():
+            args.extend((field, value))
+        _status_cache_invalidate(session_id)
+
+        with self._status_conn_lock:
+            for attempt in (1, 2):
+                try:
+                    conn = self._status_connection()
+                    if conn is None:
+                        break
+                    if not reply:
+                        conn.send_command("HSET", key, *args)
+                        return None
+                    conn.send_packed_command(conn.pack_commands([
+                        ("CLIENT", "REPLY", "ON"),
+                        ("HSET", key, *args),
+                        ("CLIENT", "REPLY", "OFF"),
+                    ]))
+                    conn.read_response()  # OK for CLIENT REPLY ON
+                    return conn.read_response()
+                except (redis.ConnectionError, redis.TimeoutError) as e:
+                    if self._status_conn is not None:
+                        self._status_conn.disconnect()
+                    logger.warning(
+                        f"⚠️ Status write for {session_id} failed on attempt {attempt}: {e}"
+                    )
+            return self.client.hset(key, mapping=string_updates)
+
+    def write_hash_nowait(self, key: str, mapping: Dict[str, Any], expire_seconds: Optional[int] = None):
+        """Fire-and-forget HSET (plus optional EXPIRE) for best-effort telemetry keys
+
+        Uses the reply-less status connection, so the caller never waits on Redis.
+        """
+        args = []
+        for field, value in _encode_stream_fields(mapping).items():
+            args.extend((field, value))
+        commands = [("HSET", key, *args)]
+        if expire_seconds:
+            commands.append(("EXPIRE", key, expire_seconds))
+
+        with self._status_conn_lock:
+            conn = self._status_connection()
+            if conn is None:
+                pipe = self.client.pipeline(transaction=False)
+                for command in commands:
+                    pipe.execute_command(*command)
+                pipe.execute()
+                return
+            try:
+                conn.send_packed_command(conn.pack_commands(commands))
+            except (redis.ConnectionError, redis.TimeoutError) as e:
+                conn.disconnect()
+                logger.error(f"Error writing {key}: {e}")
+                raise
+
+    def scan_session_ids(self, status: Optional[str] = None, count: int = 500):
+        """Yield session IDs from session_status:* keys via SCAN, optionally filtered by status"""
+        cursor = 0
+        while True:
+            cursor, keys = self.client.scan(cursor, match="session_status:*", count=count)
+            if keys:
+                if status is not None:
+                    # One pipelined HGET per SCAN page instead of one round-trip per key
+                    pipe = self.client.pipeline(transaction=False)
+                    for key in keys:
+                        pipe.hget(key, "status")
+                    keys = [key for key, value in zip(keys, pipe.execute()) if value == status]
+                for key in keys:
+                    yield key.split(":", 1)[1]
+            if cursor == 0:
+                break
+
     def get_stream_info(self, stream_name: str) -> Dict[str, Any]:
         """Get information about a stream"""
         try:
@@ -197,6 +594,35 @@ class RedisClient:
             logger.error(f"Error getting stream info for {stream_name}: {e}")
             return {}
 
+    def get_streams_snapshot(self, stream_groups: Dict[str, Optional[str]]) -> Dict[str, Dict[str, Any]]:
+        """Stream info and pending entries for several streams in one pipelined round-trip
+
+        stream_groups maps stream name -> consumer group (or None to skip XPENDING).
+        Returns {stream: {"info": dict, "pending": list}}, with {} / [] on per-stream errors
+        like get_stream_info and get_pending_messages.
+        """
+        snapshot = {
+            stream_name: {"info": {}, "pending": []} for stream_name in stream_groups
+        }
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            slots = []
+            for stream_name, consumer_group in stream_groups.items():
+                pipe.xinfo_stream(stream_name)
+                slots.append((stream_name, "info"))
+                if consumer_group:
+                    pipe.xpending_range(stream_name, consumer_group, "-", "+", 10)
+                    slots.append((stream_name, "pending"))
+
+            for (stream_name, field), result in zip(slots, pipe.execute(raise_on_error=False)):
+                if isinstance(result, Exception):
+                    logger.error(f"Error getting {field} for {stream_name}: {result}")
+                    continue
+                snapshot[stream_name][field] = result
+        except Exception as e:
+            logger.error(f"Error getting streams snapshot: {e}")
+        return snapshot
+
     def get_pending_messages(self, stream_name: str, consumer_group: str) -> list:
         """Get pending messages for a consumer group"""
         try:
@@ -209,52 +635,65 @@ class RedisClient:
             return []
         
     def acknowledge_message(self, stream_name: str, consumer_group: str, message_id: str):
-        """Acknowledge processed message"""
+        """Acknowledge processed message (kept for compatibility; prefer acknowledge_messages)"""
+        self.acknowledge_messages(stream_name, consumer_group, [message_id])
+
+    def acknowledge_messages(self, stream_name: str, consumer_group: str, message_ids: Iterable[str]) -> int:
+        """Acknowledge a batch of processed messages with a single XACK"""
+        message_ids = list(message_ids)
+        if not message_ids:
+            return 0
         try:
-            self.client.xack(stream_name, consumer_group, message_id)
-            logger.debug(f"Acknowledged message {message_id} in {stream_name}")
+            acked = self.client.xack(stream_name, consumer_group, *message_ids)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Acknowledged %d/%d messages in %s", acked, len(message_ids), stream_name)
+            return acked
         except Exception as e:
-            logger.error(f"Error acknowledging message {message_id}: {e}")
+            logger.error(f"Error acknowledging {len(message_ids)} messages in {stream_name}: {e}")
             raise
     
-    def claim_old_messages(self, stream_name: str, consumer_group: str, consumer_name: str, min_idle_time: int = 300000):
-        """Claim messages idle for more than 5 minutes"""
-        try:
-            # Get pending messages
-            pending = self.client.xpending_range(
-                stream_name, consumer_group, "-", "+", 100
-            )
-            
-            claimed_messages = []
-            for msg in pending:
-                message_id = msg["message_id"]
-                idle_time = msg["time_since_delivered"]
-                
-                if idle_time > min_idle_time:
-                    try:
-                        # Claim ownership
-                        claimed = self.client.xclaim(
-                            stream_name,
-                            consumer_group,
-                            consumer_name,
-                            min_idle_time=min_idle_time,
-                            message_ids=[message_id]
-                        )
-                        
-                        if claimed:
-                            # Parse claimed message
-                            for stream_claimed in claimed:
-                                claimed_messages.append((stream_claimed[0], stream_claimed[1]))
-                            logger.info(f"⚡ Claimed stuck message: {message_id}")
-                            
-                    except Exception as e:
-                        logger.warning(f"Could not claim {message_id}: {e}")
+    def iter_claim_old_messages(
+        self, stream_name: str, consumer_group: str, consumer_name: str,
+        min_idle_time: int = 300000, page_size: int = 100,
+    ) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Yield idle messages as they are claimed, one XAUTOCLAIM page at a time
+
+        The next page is only claimed once the caller has consumed the current
+        one, so memory stays bounded and claimed entries don't sit idle behind a
+        long backlog. Stops (after logging) if Redis errors mid-scan.
+        """
+        # XAUTOCLAIM scans the PEL and claims idle entries server-side,
+        # returning a cursor to continue from ("0-0" once the scan is done)
+        cursor = "0-0"
+        while True:
+            try:
+                result = self.client.xautoclaim(
+                    stream_name,
+                    consumer_group,
+                    consumer_name,
+                    min_idle_time=min_idle_time,
+                    start_id=cursor,
+                    count=page_size
+                )
+            except Exception as e:
+                logger.error(f"Error claiming messages: {e}")
+                return
+            cursor, claimed = result[0], result[1]
             
-            return claimed_messages
+            for message_id, fields in claimed:
+                # Entries deleted from the stream come back without fields
+                if fields is not None:
+                    logger.info("⚡ Claimed stuck message: %s", message_id)
+                    yield message_id, fields
             
-        except Exception as e:
-            logger.error(f"Error claiming messages: {e}")
-            return []
+            if cursor in ("0-0", b"0-0"):
+                return
+
+    def claim_old_messages(self, stream_name: str, consumer_group: str, consumer_name: str, min_idle_time: int = 300000):
+        """Claim messages idle for more than 5 minutes"""
+        return list(self.iter_claim_old_messages(
+            stream_name, consumer_group, consumer_name, min_idle_time=min_idle_time
+        ))
 
     def get_retry_count(self, message_data: dict) -> int:
         """Get retry count from message data"""
@@ -263,8 +702,22 @@ class RedisClient:
         except:
             return 0
 
+    def bump_retry(self, stream_name: str, message_id: str, expire_seconds: int = 3600) -> int:
+        """Atomically count another delivery attempt for message_id; returns the new count
+
+        Kept in a per-stream hash, so the count survives redelivery to any worker
+        (the retry_count field on the entry itself is only a local copy).
+        """
+        key = f"retries:{stream_name}"
+        pipe = self.client.pipeline(transaction=False)
+        pipe.hincrby(key, message_id, 1)
+        pipe.expire(key, expire_seconds)
+        count, _ = pipe.execute()
+        return int(count)
+
     def increment_retry_count(self, message_data: dict) -> dict:
         """Increment retry count in message data"""
         retry_count = self.get_retry_count(message_data)
         message_data["retry_count"] = str(retry_count + 1)
         return message_data
+
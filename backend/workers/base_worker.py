@@ -1,16 +1,79 @@
 import os
+import atexit
+import queue
+import random
 import signal
 import sys
+import threading
 import time
 import logging
+import logging.handlers
 from abc import ABC, abstractmethod
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-from core.redis_client import RedisClient
+from core.redis_client import RedisClient, REDIS_SOCKET_TIMEOUT
 from config import config
 
 logger = logging.getLogger(__name__)
 
+# (stream, group) pairs already verified by a worker in this process
+_GROUPS_READY = set()
+
+# XAUTOCLAIM one page of idle entries and XACK them in the same server-side call.
+# KEYS[1] = stream; ARGV = group, consumer, min idle ms, start id, page size.
+# Returns {next cursor, number of entries cleared}.
+_CLAIM_ACK_LUA = """
+local res = redis.call('XAUTOCLAIM', KEYS[1], ARGV[1], ARGV[2], ARGV[3], ARGV[4], 'COUNT', ARGV[5], 'JUSTID')
+local ids = res[2]
+if #ids > 0 then
+    redis.call('XACK', KEYS[1], ARGV[1], unpack(ids))
+end
+return {res[1], #ids}
+"""
+
+# Shared by every worker's handlers; the worker name is filled in per record
+_LOG_FORMATTER = logging.Formatter(
+    "%(asctime)s - %(worker_name)s - %(levelname)s - %(message)s"
+)
+
+
+class _WorkerNameFilter(logging.Filter):
+    """Stamp records with the worker name used by _LOG_FORMATTER"""
+
+    def __init__(self, worker_name: str):
+        super().__init__()
+        self.worker_name = worker_name
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.worker_name = self.worker_name
+        return True
+
+
+# Lifetime of the worker_last:<consumer> key after the worker's last status update
+WORKER_INFO_TTL = 24 * 3600
+
+# Last (epoch second, ISO string) pair produced by _utc_iso_now
+_ISO_CACHE = (0, "")
+
+
+def _utc_iso_now() -> str:
+    """UTC timestamp in ISO format at second resolution, formatted once per second"""
+    global _ISO_CACHE
+    now = int(time.time())
+    cached_second, cached_iso = _ISO_CACHE
+    if now != cached_second:
+        cached_iso = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(now))
+        _ISO_CACHE = (now, cached_iso)
+    return cached_iso
+
+
+# Acks collected during a batch are flushed at least this often (seconds), so
+# slow messages never leave finished work pending long enough to be reclaimed
+ACK_FLUSH_INTERVAL = 0.25
+
+# Consecutive idle heartbeats before a worker warns that it may be starved
+HEARTBEAT_STARVATION_TICKS = 10
+
 
 class BaseWorker(ABC):
     """Base class for all workers with enhanced error handling"""
@@ -19,32 +82,55 @@ class BaseWorker(ABC):
         self.config = config[config_name]
         self.worker_name = worker_name or self.__class__.__name__
         self.consumer_name = f"{self.worker_name}_{os.getpid()}"
+        # Shutdown signals are queued here; `running` turns False once one arrives
+        self._signals = queue.SimpleQueue()
         self.running = True
 
-        # Redis connection with retry
-        max_retries = 3
-        for attempt in range(max_retries):
-            try:
-                self.redis_client = RedisClient(
-                    host=self.config.REDIS_HOST,
-                    port=self.config.REDIS_PORT,
-                    password=self.config.REDIS_PASSWORD, 
-                    db=self.config.REDIS_DB,
-                )
-                logger.info(f"✅ Redis connected for worker {self.consumer_name}")
-                break
-            except Exception as e:
-                if attempt == max_retries - 1:
-                    logger.error(f"❌ Failed to connect to Redis after {max_retries} attempts: {e}")
-                    raise
-                logger.warning(f"⚠️ Redis connection attempt {attempt + 1} failed: {e}")
-                time.sleep(2**attempt)
+        # Redis connection; reconnects are retried with jittered backoff by the pool
+        try:
+            self.redis_client = RedisClient(
+                host=self.config.REDIS_HOST,
+                port=self.config.REDIS_PORT,
+                password=self.config.REDIS_PASSWORD, 
+                db=self.config.REDIS_DB,
+            )
+            logger.info("✅ Redis connected for worker %s", self.consumer_name)
+        except Exception as e:
+            logger.error("❌ Failed to connect to Redis: %s", e)
+            raise
 
         # Worker configuration
         self.stream_name = self.config.AUDIO_INPUT_STREAM
         self.consumer_group = self.config.CONSUMER_GROUP
-        self.block_time = self.config.WORKER_BLOCK_TIME
+        # Stay blocked in XREADGROUP as long as the socket timeout allows (BLOCK 0
+        # would never return); the heartbeat runs on its own thread
+        max_block_ms = (REDIS_SOCKET_TIMEOUT - 1) * 1000
+        self.block_time = min(self.config.WORKER_BLOCK_TIME or max_block_ms, max_block_ms)
+        self.heartbeat_interval = 30
         self.timeout = self.config.WORKER_TIMEOUT
+        self.batch_size = max(1, getattr(self.config, "WORKER_BATCH_SIZE", 16))
+        self.batch_bytes = getattr(self.config, "WORKER_BATCH_BYTES", 0)
+
+        self._claim_ack_script = None
+        self.worker_info_key = f"worker_last:{self.consumer_name}"
+        self._worker_info_written_at = None
+        self.success_log_every = max(1, getattr(self.config, "WORKER_SUCCESS_LOG_EVERY", 1))
+        self._completed_count = 0
+        self._completed_lock = threading.Lock()
+
+        # Optional read-ahead thread keeps XREADGROUP in flight while a batch runs
+        self.read_ahead = bool(getattr(self.config, "WORKER_READ_AHEAD", False))
+        self._rx_queue = queue.Queue(maxsize=1)
+        self._read_count = self.batch_size
+
+        # Messages of a batch are processed on a thread pool when concurrency > 1;
+        # process_message implementations must be thread-safe to enable this
+        self.concurrency = max(1, getattr(self.config, "WORKER_CONCURRENCY", 1))
+        self._executor = (
+            ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix=self.worker_name)
+            if self.concurrency > 1
+            else None
+        )
 
         # Setup signal handlers
         signal.signal(signal.SIGINT, self.signal_handler)
@@ -53,36 +139,222 @@ class BaseWorker(ABC):
         # Setup logging
         self.setup_logging()
 
-        logger.info(f"Worker initialized: {self.consumer_name}")
+        logger.info("Worker initialized: %s", self.consumer_name)
 
     def setup_logging(self):
         """Setup worker-specific logging"""
-        log_formatter = logging.Formatter(
-            f"%(asctime)s - {self.worker_name} - %(levelname)s - %(message)s"
-        )
+        worker_filter = _WorkerNameFilter(self.worker_name)
 
         # Console handler
         console_handler = logging.StreamHandler(sys.stdout)
-        console_handler.setFormatter(log_formatter)
+        console_handler.setFormatter(_LOG_FORMATTER)
+        console_handler.addFilter(worker_filter)
         console_handler.setLevel(logging.INFO)
 
+        handlers = [console_handler]
+
         # File handler if logs directory exists
         if self.config.LOGS_FOLDER.exists():
             log_file = self.config.LOGS_FOLDER / f"{self.worker_name}.log"
-            file_handler = logging.FileHandler(log_file)
-            file_handler.setFormatter(log_formatter)
-            file_handler.setLevel(logging.INFO)
+            file_handler = logging.handlers.RotatingFileHandler(
+                log_file, maxBytes=16 * 1024 * 1024, backupCount=4, delay=True
+            )
+            file_handler.setFormatter(_LOG_FORMATTER)
+            file_handler.addFilter(worker_filter)
 
-            # Add handlers to logger
-            logger.addHandler(file_handler)
+            # Write the file in blocks of 64 records; errors flush immediately
+            buffered_handler = logging.handlers.MemoryHandler(
+                capacity=64, flushLevel=logging.ERROR, target=file_handler
+            )
+            buffered_handler.setLevel(logging.INFO)
+            handlers.append(buffered_handler)
+
+        # Worker threads only enqueue records; a listener thread does the
+        # stdout/file writes so slow output never stalls message processing
+        log_queue = queue.SimpleQueue()
+        self._log_listener = logging.handlers.QueueListener(
+            log_queue, *handlers, respect_handler_level=True
+        )
+        self._log_listener.start()
+        # Drain queued records on interpreter exit, whichever path run() took
+        atexit.register(self._log_listener.stop)
 
-        logger.addHandler(console_handler)
+        logger.addHandler(logging.handlers.QueueHandler(log_queue))
         logger.setLevel(logging.INFO)
 
+    @staticmethod
+    def _message_size(fields: dict) -> int:
+        """Approximate payload size of a stream entry (field names + values)"""
+        return sum(len(k) + len(v) for k, v in fields.items())
+
+    def _flush_acks(self, message_ids: list):
+        """Acknowledge collected message IDs with one XACK, falling back to per-ID acks"""
+        if not message_ids:
+            return
+        try:
+            self.redis_client.acknowledge_messages(
+                self.stream_name, self.consumer_group, message_ids
+            )
+        except Exception as e:
+            logger.warning("⚠️ Batch ack failed (%s), acknowledging individually", e)
+            for message_id in message_ids:
+                try:
+                    self.redis_client.acknowledge_message(
+                        self.stream_name, self.consumer_group, message_id
+                    )
+                except Exception as ack_error:
+                    logger.error("❌ Could not acknowledge %s: %s", message_id, ack_error)
+        finally:
+            message_ids.clear()
+
+    def _read_batch(self) -> list:
+        """One XREADGROUP for up to the current read count"""
+        return self.redis_client.read_stream(
+            self.stream_name,
+            self.consumer_group,
+            self.consumer_name,
+            count=self._read_count,
+            block=self.block_time,
+        )
+
+    def _next_batch(self) -> list:
+        """Next batch to process, from the read-ahead thread when enabled"""
+        if not self.read_ahead:
+            return self._read_batch()
+        try:
+            return self._rx_queue.get(timeout=self.block_time / 1000)
+        except queue.Empty:
+            return []
+
+    def _reader_loop(self):
+        """Read-ahead thread: fetch the next batch while the current one is processed"""
+        while self.running:
+            messages = self._read_batch()
+            if not messages:
+                continue
+            # The queue holds one batch, so at most one batch is read ahead
+            while self.running:
+                try:
+                    self._rx_queue.put(messages, timeout=0.5)
+                    break
+                except queue.Full:
+                    continue
+
+    def _heartbeat_loop(self):
+        """Log a heartbeat only for ticks with no completed messages, off the consume loop"""
+        # Compares the completed-message counter between ticks, so the hot path
+        # pays nothing for idle detection
+        last_completed = self._completed_count
+        idle_ticks = 0
+        while self.running:
+            self._sleep_while_running(self.heartbeat_interval)
+            if not self.running:
+                break
+
+            completed = self._completed_count
+            if completed != last_completed:
+                last_completed = completed
+                idle_ticks = 0
+                continue
+
+            idle_ticks += 1
+            if idle_ticks % HEARTBEAT_STARVATION_TICKS == 0:
+                logger.warning(
+                    "⚠️ No messages completed in %ds - check %s for starvation",
+                    idle_ticks * self.heartbeat_interval, self.stream_name,
+                )
+            else:
+                logger.info("💓 Heartbeat - waiting for messages...")
+
+    def _handle_message(self, message_id, fields) -> str:
+        """Process one stream entry; returns done, dead (sent to DLQ), retry or error"""
+        logger.info("📨 Processing %s", message_id)
+
+        try:
+            # Check retry count
+            retry_count = self.redis_client.get_retry_count(fields)
+            
+            if retry_count >= 3:
+                logger.warning("💀 Max retries for %s", message_id)
+                self.send_to_dead_letter_queue(
+                    message_id, fields, "Max retries exceeded"
+                )
+                return "dead"
+            
+            # Increment retry count
+            if retry_count > 0:
+                fields = self.redis_client.increment_retry_count(fields)
+                logger.info("🔄 Retry %d/3", retry_count + 1)
+            
+            # Process message
+            if self.process_message(fields):
+                # _handle_message runs on pool threads, so the bump must be atomic
+                with self._completed_lock:
+                    self._completed_count += 1
+                    completed = self._completed_count
+                if completed % self.success_log_every == 0:
+                    logger.info("✅ Completed %s (%d total)", message_id, completed)
+                return "done"
+
+            # Don't acknowledge - let it retry
+            logger.error("❌ Failed %s, will retry", message_id)
+            return "retry"
+
+        except Exception as e:
+            logger.error("❌ Processing error: %s", e)
+            
+            session_id = fields.get("session_id")
+            if session_id:
+                try:
+                    self.handle_message_error(session_id, e)
+                except:
+                    pass
+            return "error"
+
+    def _process_batch(self, entries):
+        """Yield (message_id, outcome) for a batch, concurrently when a pool is configured"""
+        if self._executor is None:
+            for message_id, fields in entries:
+                yield message_id, self._handle_message(message_id, fields)
+            return
+
+        futures = {
+            self._executor.submit(self._handle_message, message_id, fields): message_id
+            for message_id, fields in entries
+        }
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+    def _sleep_while_running(self, seconds: float, step: float = 0.5):
+        """Sleep up to `seconds`, returning early once a shutdown signal arrives"""
+        deadline = time.monotonic() + seconds
+        while self.running:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            time.sleep(min(step, remaining))
+
+    @property
+    def running(self) -> bool:
+        """True until stop is requested or a shutdown signal has been queued
+
+        Sticky: once a signal is seen the flag latches off, so draining the
+        signal queue later cannot make a stopped worker look alive again.
+        """
+        if self._running and not self._signals.empty():
+            self._running = False
+        return self._running
+
+    @running.setter
+    def running(self, value: bool):
+        self._running = bool(value)
+
     def signal_handler(self, signum, frame):
         """Handle shutdown signals gracefully"""
-        logger.info(f"Received signal {signum}, shutting down gracefully...")
-        self.running = False
+        # Only enqueue the signal here (SimpleQueue.put is reentrant): logging
+        # takes locks that the interrupted frame may already hold, and run()
+        # reports the signal once the loop exits
+        self._signals.put_nowait(signum)
 
     @abstractmethod
     def process_message(self, message_data: dict) -> bool:
@@ -95,19 +367,31 @@ class BaseWorker(ABC):
         pass
 
     def update_session_status(self, session_id: str, updates: dict):
-        """Update session status with worker info"""
+        """Update session status; worker info goes to a per-worker key at most once a second"""
         try:
-            updates.update(
-                {"worker": self.consumer_name, "last_update": datetime.utcnow().isoformat()}
+            now_iso = _utc_iso_now()
+            if now_iso != self._worker_info_written_at:
+                # Worker name and timestamp are identical across a worker's updates,
+                # so they live in worker_last:<consumer> instead of every session hash;
+                # it is telemetry only, so the write doesn't wait for a reply
+                self.redis_client.write_hash_nowait(self.worker_info_key, {
+                    "worker": self.consumer_name,
+                    "last_update": now_iso,
+                    "last_session": session_id,
+                }, expire_seconds=WORKER_INFO_TTL)
+                self._worker_info_written_at = now_iso
+            # Progress-only pings don't need Redis to answer; any status
+            # transition waits for the reply so a failed write is noticed
+            self.redis_client.write_session_status(
+                session_id, updates, reply="status" in updates
             )
-            self.redis_client.update_session_status(session_id, updates)
         except Exception as e:
-            logger.error(f"❌ Error updating session status: {e}")
+            logger.error("❌ Error updating session status: %s", e)
 
     def handle_message_error(self, session_id: str, error: Exception):
         """Handle message processing errors"""
         error_msg = str(error)
-        logger.error(f"Error processing session {session_id}: {error_msg}")
+        logger.error("Error processing session %s: %s", session_id, error_msg)
 
         try:
             self.update_session_status(
@@ -115,114 +399,111 @@ class BaseWorker(ABC):
                 {
                     "status": "error",
                     "error": error_msg,
-                    "error_timestamp": datetime.utcnow().isoformat(),
+                    "error_timestamp": _utc_iso_now(),
                 },
             )
         except Exception as e:
-            logger.error(f"❌ Error updating error status: {e}")
+            logger.error("❌ Error updating error status: %s", e)
 
     def cleanup_consumer_group(self):
         """FIXED: Clean up pending messages in consumer group"""
         try:
-            logger.info(f"🧹 Cleaning up consumer group {self.consumer_group}")
+            logger.info("🧹 Cleaning up consumer group %s", self.consumer_group)
             
-            # Get pending messages
-            pending = self.redis_client.client.xpending_range(
-                self.stream_name, self.consumer_group, "-", "+", 100
-            )
+            # Claim and acknowledge every pending message, regardless of idle time
+            cleaned = self._claim_and_ack_pending(min_idle_time=0)
             
-            if pending:
-                logger.info(f"🧹 Found {len(pending)} pending messages, cleaning up...")
-                
-                # Claim and acknowledge pending messages
-                for msg in pending:
-                    message_id = msg["message_id"]
-                    try:
-                        # FIXED: Use message_ids (list) instead of message_id
-                        claimed = self.redis_client.client.xclaim(
-                            self.stream_name,
-                            self.consumer_group,
-                            self.consumer_name,
-                            min_idle_time=0,
-                            message_ids=[message_id]  # FIXED: List instead of single ID
-                        )
-                        
-                        if claimed:
-                            # Acknowledge it
-                            self.redis_client.acknowledge_message(
-                                self.stream_name, self.consumer_group, message_id
-                            )
-                            logger.debug(f"🧹 Cleaned up pending message: {message_id}")
-                            
-                    except Exception as e:
-                        logger.warning(f"⚠️ Could not clean up message {message_id}: {e}")
-                        # Still try to acknowledge it to prevent blocking
-                        try:
-                            self.redis_client.acknowledge_message(
-                                self.stream_name, self.consumer_group, message_id
-                            )
-                        except:
-                            pass
-                        
-                logger.info(f"✅ Consumer group cleanup completed")
+            if cleaned:
+                logger.info("✅ Consumer group cleanup completed (%s messages)", cleaned)
             else:
-                logger.info(f"✅ No pending messages to clean up")
+                logger.info("✅ No pending messages to clean up")
                 
         except Exception as e:
-            logger.warning(f"⚠️ Error during consumer group cleanup: {e}")
+            logger.warning("⚠️ Error during consumer group cleanup: %s", e)
+
+    def _claim_and_ack_pending(self, min_idle_time: int) -> int:
+        """Claim and acknowledge idle pending messages, one atomic script call per page of 100"""
+        if self._claim_ack_script is None:
+            # EVALSHA with an automatic EVAL fallback on NOSCRIPT
+            self._claim_ack_script = self.redis_client.client.register_script(_CLAIM_ACK_LUA)
+
+        cleared = 0
+        cursor = "0-0"
+        while True:
+            cursor, page_cleared = self._claim_ack_script(
+                keys=[self.stream_name],
+                args=[self.consumer_group, self.consumer_name, min_idle_time, cursor, 100],
+            )
+            
+            if page_cleared:
+                cleared += page_cleared
+                logger.debug("🧹 Cleared %s pending messages", page_cleared)
+            
+            if cursor in ("0-0", b"0-0"):
+                return cleared
 
     def recover_stuck_messages(self):
         """Claim and process messages stuck for >5 minutes"""
         try:
-            logger.info(f"🔄 Checking for stuck messages in {self.stream_name}...")
+            logger.info("🔄 Checking for stuck messages in %s...", self.stream_name)
             
-            stuck_messages = self.redis_client.claim_old_messages(
+            # Claimed page by page while earlier pages are being processed
+            stuck_messages = self.redis_client.iter_claim_old_messages(
                 self.stream_name,
                 self.consumer_group,
                 self.consumer_name,
                 min_idle_time=300000  # 5 minutes
             )
             
-            if not stuck_messages:
-                logger.info("✅ No stuck messages found")
-                return
-            
-            logger.info(f"🔄 Found {len(stuck_messages)} stuck messages, processing...")
-            
-            for message_id, fields in stuck_messages:
-                try:
-                    retry_count = self.redis_client.get_retry_count(fields)
-                    
-                    if retry_count >= 3:
-                        # Max retries exceeded - send to DLQ
-                        logger.warning(f"💀 Max retries for {message_id}, moving to DLQ")
-                        self.send_to_dead_letter_queue(message_id, fields, "Max retries exceeded")
-                        self.redis_client.acknowledge_message(
-                            self.stream_name, self.consumer_group, message_id
-                        )
-                    else:
-                        # Increment retry and process
-                        fields = self.redis_client.increment_retry_count(fields)
-                        logger.info(f"🔄 Retry {retry_count + 1}/3 for {message_id}")
-                        
-                        success = self.process_message(fields)
+            found = 0
+            recovered_ids = []
+            last_ack_flush = time.monotonic()
+            try:
+                for message_id, fields in stuck_messages:
+                    found += 1
+                    try:
+                        # Authoritative retry count lives in Redis (one HINCRBY), since
+                        # the claimed entry's own fields never change between deliveries
+                        retry_count = self.redis_client.bump_retry(self.stream_name, message_id)
+                        fields["retry_count"] = str(retry_count)
                         
-                        if success:
-                            self.redis_client.acknowledge_message(
-                                self.stream_name, self.consumer_group, message_id
+                        if retry_count > 3:
+                            # Max retries exceeded - DLQ entry and ack in one round-trip
+                            logger.warning("💀 Max retries for %s, moving to DLQ", message_id)
+                            self.send_to_dead_letter_queue(
+                                message_id, fields, "Max retries exceeded", ack=True
                             )
-                            logger.info(f"✅ Recovered message {message_id}")
                         else:
-                            logger.warning(f"⚠️ Recovery failed for {message_id}, will retry later")
+                            # Process the retry
+                            logger.info("🔄 Retry %s/3 for %s", retry_count, message_id)
+                            
+                            success = self.process_message(fields)
                             
-                except Exception as e:
-                    logger.error(f"❌ Error recovering {message_id}: {e}")
+                            if success:
+                                recovered_ids.append(message_id)
+                                logger.info("✅ Recovered message %s", message_id)
+                            else:
+                                logger.warning("⚠️ Recovery failed for %s, will retry later", message_id)
+                                
+                    except Exception as e:
+                        logger.error("❌ Error recovering %s: %s", message_id, e)
+
+                    if recovered_ids and time.monotonic() - last_ack_flush >= ACK_FLUSH_INTERVAL:
+                        self._flush_acks(recovered_ids)
+                        last_ack_flush = time.monotonic()
+            finally:
+                self._flush_acks(recovered_ids)
+
+            if found:
+                logger.info("🔄 Processed %s stuck messages", found)
+            else:
+                logger.info("✅ No stuck messages found")
                     
         except Exception as e:
-            logger.warning(f"⚠️ Recovery process error: {e}")
+            logger.warning("⚠️ Recovery process error: %s", e)
 
-    def send_to_dead_letter_queue(self, message_id, message_data, error):
-        """Move failed messages to DLQ"""
+    def send_to_dead_letter_queue(self, message_id, message_data, error, ack=False):
+        """Move failed messages to DLQ (ack=True also acks the original in the same round-trip)"""
         try:
             dlq_stream = f"{self.stream_name}_dlq"
             
@@ -230,179 +511,190 @@ class BaseWorker(ABC):
                 "original_message_id": message_id,
                 "original_stream": self.stream_name,
                 "error": str(error),
-                "failed_at": datetime.utcnow().isoformat(),
+                "failed_at": _utc_iso_now(),
+                "failed_at_ns": str(time.time_ns()),
                 "retry_count": message_data.get("retry_count", "0"),
+                # Whole original entry as one JSON field (decode with json.loads)
+                # instead of one original_<key> field per entry field
+                "original_payload": dict(message_data),
             }
             
-            # Add original data
-            for key, value in message_data.items():
-                dlq_data[f"original_{key}"] = value
-            
-            self.redis_client.add_to_stream(dlq_stream, dlq_data)
-            logger.info(f"💀 Moved to DLQ: {message_id} -> {dlq_stream}")
+            if ack:
+                self.redis_client.add_to_stream_and_ack(
+                    dlq_stream, dlq_data, self.stream_name, self.consumer_group, message_id
+                )
+            else:
+                self.redis_client.add_to_stream(dlq_stream, dlq_data)
+            logger.info("💀 Moved to DLQ: %s -> %s", message_id, dlq_stream)
             
         except Exception as e:
-            logger.error(f"❌ DLQ error: {e}")
+            logger.error("❌ DLQ error: %s", e)
 
     def ensure_consumer_group_exists(self):
         """Ensure consumer group exists and is properly configured"""
+        group_key = (self.stream_name, self.consumer_group)
+        if group_key in _GROUPS_READY:
+            return
+
         try:
-            # Create consumer group if it doesn't exist
-            self.redis_client.client.xgroup_create(
-                self.stream_name, self.consumer_group, id="0", mkstream=True
-            )
-            logger.info(f"✅ Consumer group {self.consumer_group} ready")
+            # Look the group up first so the common restart case needs no
+            # XGROUP CREATE and no BUSYGROUP exception
+            try:
+                existing = {
+                    group["name"]
+                    for group in self.redis_client.client.xinfo_groups(self.stream_name)
+                }
+            except Exception:
+                existing = set()  # Stream doesn't exist yet
+
+            # Only the first worker of a rollout issues XGROUP CREATE; the rest see
+            # the short-lived sentinel and skip it. If the winner failed, read_stream
+            # gets NOGROUP and recreates the group on its next poll.
+            sentinel = f"bootstrap:{self.stream_name}:{self.consumer_group}"
+            if self.consumer_group in existing:
+                logger.info("✅ Consumer group %s already exists", self.consumer_group)
+            elif self.redis_client.client.set(sentinel, self.consumer_name, nx=True, ex=30):
+                self.redis_client.client.xgroup_create(
+                    self.stream_name, self.consumer_group, id="0", mkstream=True
+                )
+                logger.info("✅ Consumer group %s ready", self.consumer_group)
+            else:
+                logger.info("✅ Consumer group %s bootstrapped by another worker", self.consumer_group)
         except Exception as e:
             if "BUSYGROUP" in str(e):
-                logger.info(f"✅ Consumer group {self.consumer_group} already exists")
+                logger.info("✅ Consumer group %s already exists", self.consumer_group)
             else:
-                logger.error(f"❌ Error with consumer group: {e}")
+                logger.error("❌ Error with consumer group: %s", e)
                 raise
 
-    def recover_pending_messages(self):
-        """Recover and reprocess pending messages older than 5 minutes"""
-        try:
-            # Get pending messages older than 5 minutes
-            pending = self.redis_client.client.xpending_range(
-                self.stream_name, self.consumer_group, "-", "+", 100
-            )
-            
-            recovered = 0
-            for msg in pending:
-                message_id = msg["message_id"]
-                idle_time = msg["time_since_delivered"]
-                
-                # If message is pending for more than 5 minutes, claim it
-                if idle_time > 300000:  # 5 minutes in milliseconds
-                    try:
-                        claimed = self.redis_client.client.xclaim(
-                            self.stream_name, self.consumer_group, self.consumer_name,
-                            min_idle_time=300000, message_ids=[message_id]
-                        )
-                        
-                        if claimed:
-                            # Just acknowledge old stuck messages to clear the queue
-                            self.redis_client.acknowledge_message(
-                                self.stream_name, self.consumer_group, message_id
-                            )
-                            recovered += 1
-                            logger.info(f"🔄 Recovered stuck message: {message_id}")
-                            
-                    except Exception as e:
-                        logger.warning(f"⚠️ Could not recover message {message_id}: {e}")
-            
-            if recovered > 0:
-                logger.info(f"🔄 Recovered {recovered} stuck messages from queue")
-                
-        except Exception as e:
-            logger.warning(f"⚠️ Error during message recovery: {e}")
+        _GROUPS_READY.add(group_key)
+        self.redis_client.mark_group_created(self.stream_name, self.consumer_group)
 
     def run(self):
         """FIXED: Enhanced run with recovery and proper acknowledgment"""
-        logger.info(f"🚀 Starting {self.worker_name}...")
-
-        if not self.check_dependencies():
-            logger.error("❌ Dependency check failed")
-            return 1
-
-        self.ensure_consumer_group_exists()
+        logger.info("🚀 Starting %s...", self.worker_name)
+
+        # Dependency checks and consumer group setup are independent I/O, so
+        # startup waits for the slower of the two instead of their sum
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix=f"{self.worker_name}-startup") as startup:
+            deps_future = startup.submit(self.check_dependencies)
+            group_future = startup.submit(self.ensure_consumer_group_exists)
+
+            if not deps_future.result():
+                logger.error("❌ Dependency check failed")
+                return 1
+            group_future.result()
         
-        # Recover stuck messages on startup
+        # Recover stuck messages on startup (needs the consumer group)
         self.recover_stuck_messages()
 
         consecutive_errors = 0
         max_consecutive_errors = 5
-        heartbeat_interval = 30
-        last_heartbeat = time.time()
+        self._read_count = self.batch_size
+
+        if self.read_ahead:
+            threading.Thread(
+                target=self._reader_loop, name=f"{self.worker_name}-reader", daemon=True
+            ).start()
 
-        logger.info(f"✅ {self.worker_name} ready")
+        threading.Thread(
+            target=self._heartbeat_loop, name=f"{self.worker_name}-heartbeat", daemon=True
+        ).start()
+
+        logger.info("✅ %s ready", self.worker_name)
 
         while self.running:
             try:
-                current_time = time.time()
-                if current_time - last_heartbeat >= heartbeat_interval:
-                    logger.info(f"💓 Heartbeat - waiting for messages...")
-                    last_heartbeat = current_time
-
-                messages = self.redis_client.read_stream(
-                    self.stream_name,
-                    self.consumer_group,
-                    self.consumer_name,
-                    count=1,
-                    block=self.block_time,
-                )
+                messages = self._next_batch()
 
                 if not messages:
                     consecutive_errors = 0
                     continue
 
-                for stream, stream_messages in messages:
-                    for message_id, fields in stream_messages:
-                        logger.info(f"📨 Processing {message_id}")
-
-                        try:
-                            # Check retry count
-                            retry_count = self.redis_client.get_retry_count(fields)
-                            
-                            if retry_count >= 3:
-                                logger.warning(f"💀 Max retries for {message_id}")
-                                session_id = fields.get("session_id")
-                                self.send_to_dead_letter_queue(
-                                    message_id, fields, "Max retries exceeded"
-                                )
-                                self.redis_client.acknowledge_message(
-                                    self.stream_name, self.consumer_group, message_id
-                                )
-                                continue
-                            
-                            # Increment retry count
-                            if retry_count > 0:
-                                fields = self.redis_client.increment_retry_count(fields)
-                                logger.info(f"🔄 Retry {retry_count + 1}/3")
-                            
-                            # Process message
-                            success = self.process_message(fields)
+                if not self.running:
+                    # Signal arrived while blocked; entries stay pending and are
+                    # reclaimed by recovery instead of starting a new batch now
+                    unprocessed = sum(len(stream_messages) for _, stream_messages in messages)
+                    logger.info("🛑 Shutdown requested, leaving %s messages pending", unprocessed)
+                    break
 
-                            if success:
-                                # Only acknowledge on success
-                                self.redis_client.acknowledge_message(
-                                    self.stream_name, self.consumer_group, message_id
-                                )
-                                logger.info(f"✅ Completed {message_id}")
-                                consecutive_errors = 0
-                            else:
-                                # Don't acknowledge - let it retry
-                                logger.error(f"❌ Failed {message_id}, will retry")
+                entries = [
+                    (message_id, fields)
+                    for stream, stream_messages in messages
+                    for message_id, fields in stream_messages
+                ]
+
+                # Soft byte cap: every delivered entry is still processed (they are
+                # already pending for this consumer), but an oversized batch shrinks
+                # the next XREADGROUP count to what fit under WORKER_BATCH_BYTES
+                batch_bytes = 0
+                fitted = 0
+                if self.batch_bytes:
+                    for message_id, fields in entries:
+                        batch_bytes += self._message_size(fields)
+                        if batch_bytes <= self.batch_bytes:
+                            fitted += 1
+
+                pending_acks = []
+                last_ack_flush = time.monotonic()
 
-                        except Exception as e:
-                            logger.error(f"❌ Processing error: {e}")
-                            
-                            session_id = fields.get("session_id")
-                            if session_id:
-                                try:
-                                    self.handle_message_error(session_id, e)
-                                except:
-                                    pass
-                            
+                try:
+                    for message_id, outcome in self._process_batch(entries):
+                        if outcome in ("done", "dead"):
+                            # Only acknowledge on success or DLQ (batched, see _flush_acks)
+                            pending_acks.append(message_id)
+                        if outcome == "done":
+                            consecutive_errors = 0
+                        elif outcome == "error":
                             # Don't acknowledge - let it retry
                             consecutive_errors += 1
 
+                        if pending_acks and (
+                            len(pending_acks) >= self.redis_client.ack_batch_size
+                            or time.monotonic() - last_ack_flush >= ACK_FLUSH_INTERVAL
+                        ):
+                            self._flush_acks(pending_acks)
+                            last_ack_flush = time.monotonic()
+                finally:
+                    # Finished work is acked even if the batch is cut short by an
+                    # error or interrupt, so it isn't redelivered and reprocessed
+                    self._flush_acks(pending_acks)
+
+                if self.batch_bytes and batch_bytes > self.batch_bytes:
+                    self._read_count = max(1, fitted)
+                else:
+                    self._read_count = self.batch_size
+
             except KeyboardInterrupt:
                 logger.info("📨 Keyboard interrupt")
                 break
             except Exception as e:
-                logger.error(f"❌ Loop error: {e}")
+                logger.error("❌ Loop error: %s", e)
                 consecutive_errors += 1
                 
                 if consecutive_errors >= max_consecutive_errors:
-                    logger.error(f"❌ Too many errors ({consecutive_errors}), exiting")
+                    logger.error("❌ Too many errors (%s), exiting", consecutive_errors)
                     break
                     
-                sleep_time = min(5 * consecutive_errors, 30)
-                logger.info(f"⏳ Sleeping {sleep_time}s...")
-                time.sleep(sleep_time)
+                # Full-jitter exponential backoff so a fleet of workers doesn't
+                # retry a recovering upstream in lockstep
+                sleep_time = random.uniform(0, min(0.5 * 2 ** min(consecutive_errors, 6), 30))
+                logger.info("⏳ Sleeping %.1fs...", sleep_time)
+                self._sleep_while_running(sleep_time)
+
+        # Latch off before draining the signals, so every `while self.running`
+        # loop (heartbeat, reader, subclass threads) stays stopped
+        self.running = False
+        received = []
+        while not self._signals.empty():
+            received.append(self._signals.get_nowait())
+        if received:
+            logger.info("Received signal %s, shutting down gracefully...", received[0])
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
 
-        logger.info(f"🛑 {self.worker_name} stopped")
+        logger.info("🛑 %s stopped", self.worker_name)
         return 0
 
     def get_worker_stats(self):
@@ -15,7 +15,10 @@ from pathlib import Path
 from typing import Dict, List, Optional
 from dotenv import load_dotenv
 import asyncio
+import collections
+import hashlib
 import threading
+from concurrent.futures import ThreadPoolExecutor
 
 # Load environment variables
 load_dotenv()
@@ -25,17 +28,65 @@ sys.path.append(str(Path(__file__).parent.parent))
 
 from workers.base_worker import BaseWorker
 
-# Try to import MongoDB clients
+# Optional fast JSON encoder for the Redis copy and the file backup
 try:
-    from core.mongodb_client import MongoDBClient, HybridStorageClient
-    MONGODB_AVAILABLE = True
+    import orjson
+    ORJSON_AVAILABLE = True
 except ImportError:
-    MONGODB_AVAILABLE = False
-    MongoDBClient = None
-    HybridStorageClient = None
+    ORJSON_AVAILABLE = False
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+# MongoDB session-status mirrors are buffered and written with one bulk_write
+# once this many are queued, or at least every MONGO_STATUS_FLUSH_INTERVAL seconds
+MONGO_STATUS_BATCH = 16
+MONGO_STATUS_FLUSH_INTERVAL = 1.0
+
+# The intermediate "processing" status is only written for extractions still
+# running after this many seconds; fast ones go straight to "completed"
+PROCESSING_STATUS_DELAY = 10.0
+
+# MongoDB health is cached: re-probed after this many seconds while healthy,
+# and sooner while down so writes resume quickly once it is back
+MONGO_HEALTHY_RECHECK = 30
+MONGO_DOWN_RECHECK = 5
+# Status updates held in memory while MongoDB is down; past this they spill to
+# Redis. Extractions always go to Redis during an outage, since their Redis
+# stream entries are already acknowledged. Both lists are replayed on recovery.
+MONGO_BACKLOG_LIMIT = 1000
+MONGO_EXTRACTION_BACKLOG_KEY = "mongo_backlog:medical_extractions"
+MONGO_STATUS_BACKLOG_KEY = "mongo_backlog:session_status"
+MONGO_REPLAY_BATCH = 50
+
+
+def _encode_backlog_entry(session_id: str, data: Dict):
+    """Serialize a deferred MongoDB write for a Redis backlog list"""
+    entry = {"session_id": session_id, "data": data}
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(entry, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(entry, default=str)
+
+
+def _decode_backlog_entry(raw) -> tuple:
+    entry = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+    return entry["session_id"], entry["data"]
+
+
+def _write_backup(path: Path, session_id: str, medical_data: Dict):
+    """Write the JSON file backup of an extraction (runs on the backup I/O pool)"""
+    try:
+        if ORJSON_AVAILABLE:
+            path.write_bytes(orjson.dumps(
+                medical_data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+            ))
+        else:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(medical_data, f, indent=2, ensure_ascii=False)
+        logger.info(f"📄 Medical data backup saved to file for session {session_id}")
+    except Exception as e:
+        logger.warning(f"⚠️ File backup failed for {session_id}: {e}")
+
 
 class EnhancedMedicalExtractionWorker(BaseWorker):
     """
@@ -51,6 +102,22 @@ class EnhancedMedicalExtractionWorker(BaseWorker):
         self.stream_name = "medical_extraction_queue"
         self.consumer_group = "medical_extractors"
         
+        # Config values read on every stored extraction
+        self._session_expire = self.config.SESSION_EXPIRE_TIME
+        self._transcripts_dir = Path(self.config.TRANSCRIPTS_FOLDER)
+        
+        # Extractions spend seconds waiting on OpenAI, so read a batch per
+        # XREADGROUP and run it concurrently; acks are still batched by BaseWorker
+        extraction_batch = max(1, getattr(self.config, "MEDICAL_EXTRACTION_BATCH", 8))
+        self.batch_size = self._read_count = extraction_batch
+        if extraction_batch > self.concurrency:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+            self.concurrency = extraction_batch
+            self._executor = ThreadPoolExecutor(
+                max_workers=extraction_batch, thread_name_prefix=self.worker_name
+            )
+        
         # Medical extraction settings
         self.enable_extraction = os.getenv("ENABLE_MEDICAL_EXTRACTION", "true").lower() == "true"
         self.openai_api_key = os.getenv("OPENAI_API_KEY")
@@ -60,13 +127,17 @@ class EnhancedMedicalExtractionWorker(BaseWorker):
         self.mongodb_client = None
         self.hybrid_client = None
         
-        if self.enable_mongodb and MONGODB_AVAILABLE:
+        if self.enable_mongodb:
             try:
                 mongodb_connection = os.getenv("MONGODB_CONNECTION_STRING")
                 mongodb_database = os.getenv("MONGODB_DATABASE_NAME", "maichart_medical")
                 
                 if mongodb_connection:
-                    self.mongodb_client = MongoDBClient(
+                    # Imported only when MongoDB is actually used: importers of
+                    # queue_for_medical_extraction (the API) don't pay for pymongo
+                    from core.mongodb_client import HybridStorageClient, get_mongodb_client
+
+                    self.mongodb_client = get_mongodb_client(
                         connection_string=mongodb_connection,
                         database_name=mongodb_database
                     )
@@ -81,14 +152,30 @@ class EnhancedMedicalExtractionWorker(BaseWorker):
                 else:
                     logger.warning("⚠️ MongoDB connection string not provided")
                     self.enable_mongodb = False
+            except ImportError as e:
+                logger.warning(f"⚠️ MongoDB client not available ({e}), continuing with Redis-only storage")
+                self.enable_mongodb = False
             except Exception as e:
                 logger.error(f"❌ Failed to initialize MongoDB: {e}")
                 logger.warning("⚠️ Continuing with Redis-only storage")
                 self.enable_mongodb = False
         
+        self._mongo_status_buffer = collections.deque()
+        self._mongo_spilled = 0
+        self._mongo_dropped = 0
+        self._mongo_flush_lock = threading.Lock()
+        self._mongo_flush_thread = None
+        self._mongo_up = True
+        self._mongo_checked_until = 0.0
+        
         # Medical extraction service (lazy loading)
         self.medical_service_loaded = False
         self.medical_service_lock = threading.Lock()
+        # One event loop on its own thread runs every extraction coroutine, so the
+        # service's shared AsyncOpenAI client always sees the same loop
+        self._loop = None
+        # File backups are written off the message path
+        self._io_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix=f"{self.worker_name}-io")
         
         if not self.enable_extraction:
             logger.warning("⚠️ Medical extraction disabled")
@@ -137,12 +224,22 @@ class EnhancedMedicalExtractionWorker(BaseWorker):
 
     def _load_medical_service(self):
         """Load medical extraction service on first use"""
+        # Double-checked: once loaded, callers return without taking the lock
+        if self.medical_service_loaded:
+            return
         with self.medical_service_lock:
             if not self.medical_service_loaded:
                 try:
                     logger.info("🔄 Loading enhanced medical extraction service...")
                     from core.enhanced_medical_extraction_service import extract_structured_medical_data
                     self.extract_medical_data = extract_structured_medical_data
+                    if self._loop is None:
+                        self._loop = asyncio.new_event_loop()
+                        threading.Thread(
+                            target=self._loop.run_forever,
+                            name=f"{self.worker_name}-loop",
+                            daemon=True,
+                        ).start()
                     self.medical_service_loaded = True
                     logger.info("✅ Enhanced medical extraction service loaded successfully")
                 except Exception as e:
@@ -173,42 +270,69 @@ class EnhancedMedicalExtractionWorker(BaseWorker):
                 logger.info(f"⏭️ Medical extraction disabled for session {session_id}")
                 return self._mark_extraction_skipped(session_id, "Medical extraction disabled")
             
-            # Load medical service if not loaded
-            if not self.medical_service_loaded:
+            # Identical transcripts (retries, re-submits) reuse the earlier extraction
+            transcript_hash = hashlib.blake2b(transcript_text.encode(), digest_size=16).hexdigest()
+            extraction_result = self._find_previous_extraction(session_id, transcript_hash)
+            
+            if extraction_result is None:
+                # Load medical service if not loaded
                 self._load_medical_service()
+                    
+                if not self.medical_service_loaded:
+                    logger.error(f"❌ Medical service not available for session {session_id}")
+                    return self._mark_extraction_failed(session_id, "Medical service not available")
                 
-            if not self.medical_service_loaded:
-                logger.error(f"❌ Medical service not available for session {session_id}")
-                return self._mark_extraction_failed(session_id, "Medical service not available")
-            
-            # Update session status to processing
-            self._update_session_status(session_id, {
-                "medical_extraction_status": "processing",
-                "medical_extraction_started_at": datetime.now(timezone.utc).isoformat(),
-                "storage_mode": "mongodb" if self.enable_mongodb else "redis_only"
-            })
-            
-            # Run medical extraction with timeout
-            extraction_result = self._run_medical_extraction_with_timeout(transcript_text)
+                # Update session status to processing, if the extraction is slow
+                started_status = {
+                    "medical_extraction_started_at": datetime.now(timezone.utc).isoformat(),
+                    "storage_mode": "mongodb" if self.enable_mongodb else "redis_only"
+                }
+                processing_timer = threading.Timer(
+                    PROCESSING_STATUS_DELAY,
+                    self._update_session_status,
+                    args=(session_id, {"medical_extraction_status": "processing", **started_status}),
+                )
+                processing_timer.daemon = True
+                processing_timer.start()
+                
+                # Run medical extraction with timeout
+                try:
+                    extraction_result = self._run_medical_extraction_with_timeout(transcript_text)
+                finally:
+                    # join() waits out a status write already in progress, so it
+                    # can never land after the final status
+                    processing_timer.cancel()
+                    processing_timer.join()
+                extraction_result["started_status"] = started_status
             
             if extraction_result["status"] == "completed":
-                # Store medical data using hybrid approach
-                success = self._store_medical_data_enhanced(session_id, extraction_result["data"])
+                # One timestamp for the stored data and the completed status
+                completed_at = datetime.now(timezone.utc).isoformat()
+                completed_status = {
+                    "medical_extraction_status": "completed",
+                    "medical_extraction_completed_at": completed_at,
+                    "medical_data_available": True,
+                    "medical_entities_count": (
+                        len(extraction_result["data"].get("symptoms", [])) + 
+                        len(extraction_result["data"].get("drug_history", [])) +
+                        len(extraction_result["data"].get("possible_diseases", []))
+                    ),
+                    "medical_processing_time": extraction_result.get("processing_time", 0),
+                    "stored_in_mongodb": self.enable_mongodb,
+                    **extraction_result.get("started_status", {})
+                }
+
+                # Store medical data using hybrid approach; the Redis session status
+                # goes out in the same pipeline as the medical data
+                success = self._store_medical_data_enhanced(
+                    session_id, extraction_result["data"],
+                    status_updates=completed_status, extracted_at=completed_at,
+                    transcript_hash=transcript_hash,
+                )
                 
                 if success:
                     # Update session status to completed
-                    self._update_session_status(session_id, {
-                        "medical_extraction_status": "completed",
-                        "medical_extraction_completed_at": datetime.now(timezone.utc).isoformat(),
-                        "medical_data_available": True,
-                        "medical_entities_count": (
-                            len(extraction_result["data"].get("symptoms", [])) + 
-                            len(extraction_result["data"].get("drug_history", [])) +
-                            len(extraction_result["data"].get("possible_diseases", []))
-                        ),
-                        "medical_processing_time": extraction_result.get("processing_time", 0),
-                        "stored_in_mongodb": self.enable_mongodb
-                    })
+                    self._update_mongodb_status(session_id, completed_status)
                     
                     logger.info(f"✅ Enhanced medical extraction completed for session {session_id}")
                     return True
@@ -219,15 +343,10 @@ class EnhancedMedicalExtractionWorker(BaseWorker):
                 # Extraction failed
                 error_msg = extraction_result.get("error", "Medical extraction failed")
                 return self._mark_extraction_failed(session_id, error_msg)
-        except openai.APIError as e:
-            logger.error(f"OpenAI API error: {e}")
-            self._mark_extraction_failed(session_id, f"API Error: {e}")
-            return True
                 
         except Exception as e:
-            logger.error(f"❌ Error processing enhanced medical extraction message: {e}")
-            import traceback
-            logger.error(f"Full traceback: {traceback.format_exc()}")
+            # Traceback is formatted by the handler, only if the record is emitted
+            logger.exception("❌ Error processing enhanced medical extraction message: %s", e)
             
             # Update session status
             if session_id:
@@ -235,28 +354,44 @@ class EnhancedMedicalExtractionWorker(BaseWorker):
             
             return True  # Return True to acknowledge message
 
+    def _find_previous_extraction(self, session_id: str, transcript_hash: str) -> Optional[Dict]:
+        """Return a completed extraction result for an identical earlier transcript, if cached"""
+        try:
+            previous_session = self.redis_client.client.get(f"medical_dedup:{transcript_hash}")
+            if not previous_session:
+                return None
+            
+            cached = self.redis_client.client.hget(f"medical_data:{previous_session}", "medical_data")
+            if not cached:
+                return None  # Expired or cleaned up; extract again
+            
+            logger.info(f"♻️ Reusing medical extraction of session {previous_session} for {session_id}")
+            return {
+                "status": "completed",
+                "data": orjson.loads(cached) if ORJSON_AVAILABLE else json.loads(cached),
+                "processing_time": 0
+            }
+            
+        except Exception as e:
+            logger.warning(f"⚠️ Duplicate transcript lookup failed for {session_id}: {e}")
+            return None
+
     def _run_medical_extraction_with_timeout(self, transcript_text: str) -> Dict:
         """Run medical extraction with timeout protection"""
         try:
-            start_time = datetime.now(timezone.utc)
-            
-            # Create new event loop for this thread
-            try:
-                loop = asyncio.get_event_loop()
-            except RuntimeError:
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
+            start_time = time.perf_counter()
             
-            # Run extraction with timeout
+            # Run extraction with timeout on the worker's shared event loop
             try:
-                extraction_data = loop.run_until_complete(
+                extraction_data = asyncio.run_coroutine_threadsafe(
                     asyncio.wait_for(
                         self.extract_medical_data(transcript_text),
                         timeout=180  # 3 minute timeout
-                    )
-                )
+                    ),
+                    self._loop,
+                ).result()
                 
-                processing_time = (datetime.now(timezone.utc) - start_time).total_seconds()
+                processing_time = time.perf_counter() - start_time
                 
                 return {
                     "status": "completed",
@@ -280,30 +415,56 @@ class EnhancedMedicalExtractionWorker(BaseWorker):
                 "data": {}
             }
 
-    def _store_medical_data_enhanced(self, session_id: str, medical_data: Dict) -> bool:
-        """Store medical data using enhanced hybrid approach"""
+    def _store_medical_data_enhanced(
+        self, session_id: str, medical_data: Dict,
+        status_updates: Optional[Dict] = None, extracted_at: Optional[str] = None,
+        transcript_hash: Optional[str] = None,
+    ) -> bool:
+        """Store medical data using enhanced hybrid approach
+
+        status_updates, if given, is written to the Redis session status in the
+        same round-trip as the medical data, as is the dedup entry for
+        transcript_hash (see _find_previous_extraction).
+        """
         try:
             success = True
             
             # Store in Redis for quick access (existing behavior)
             try:
                 medical_data_key = f"medical_data:{session_id}"
-                self.redis_client.client.hset(
+                pipe = self.redis_client.client.pipeline(transaction=False)
+                pipe.hset(
                     medical_data_key,
                     mapping={
-                        "medical_data": json.dumps(medical_data),
-                        "extracted_at": datetime.now(timezone.utc).isoformat(),
+                        "medical_data": (
+                            orjson.dumps(medical_data, option=orjson.OPT_NON_STR_KEYS)
+                            if ORJSON_AVAILABLE else json.dumps(medical_data)
+                        ),
+                        "extracted_at": extracted_at or datetime.now(timezone.utc).isoformat(),
                         "session_id": session_id
                     }
                 )
-                self.redis_client.client.expire(medical_data_key, self.config.SESSION_EXPIRE_TIME)
+                pipe.expire(medical_data_key, self._session_expire)
+                if status_updates:
+                    self.redis_client.update_session_status(session_id, status_updates, pipe=pipe)
+                if transcript_hash:
+                    # Lives as long as the medical data it points to
+                    pipe.set(
+                        f"medical_dedup:{transcript_hash}", session_id,
+                        ex=self._session_expire,
+                    )
+                pipe.execute()
                 logger.info(f"💾 Medical data stored in Redis for session {session_id}")
             except Exception as e:
                 logger.error(f"❌ Error storing in Redis: {e}")
                 success = False
             
             # Store in MongoDB if enabled
-            if self.enable_mongodb and self.mongodb_client:
+            if self.enable_mongodb and self.mongodb_client and not self._mongodb_up():
+                # Fail fast during an outage; replayed by _flush_mongodb_status
+                if self._spill_to_redis(MONGO_EXTRACTION_BACKLOG_KEY, session_id, medical_data):
+                    logger.warning(f"⚠️ MongoDB unavailable, queued medical data for {session_id} in Redis")
+            elif self.enable_mongodb and self.mongodb_client:
                 try:
                     mongo_success = self.mongodb_client.store_medical_extraction(session_id, medical_data)
                     if mongo_success:
@@ -315,15 +476,13 @@ class EnhancedMedicalExtractionWorker(BaseWorker):
                     logger.error(f"❌ MongoDB storage error for {session_id}: {e}")
                     # Continue with Redis-only storage
             
-            # Store in file for backwards compatibility
+            # Store in file for backwards compatibility (in the background; a
+            # failed backup is only logged and never fails the message)
             try:
-                medical_file_path = self.config.TRANSCRIPTS_FOLDER / f"{session_id}_medical_data.json"
-                with open(medical_file_path, 'w', encoding='utf-8') as f:
-                    json.dump(medical_data, f, indent=2, ensure_ascii=False)
-                logger.info(f"📄 Medical data backup saved to file for session {session_id}")
+                medical_file_path = self._transcripts_dir / f"{session_id}_medical_data.json"
+                self._io_executor.submit(_write_backup, medical_file_path, session_id, medical_data)
             except Exception as e:
                 logger.warning(f"⚠️ File backup failed for {session_id}: {e}")
-                # Don't fail for file storage issues
             
             # Log extraction summary
             self._log_extraction_summary(session_id, medical_data)
@@ -341,15 +500,108 @@ class EnhancedMedicalExtractionWorker(BaseWorker):
             self.redis_client.update_session_status(session_id, updates)
             
             # Update MongoDB if available
-            if self.enable_mongodb and self.mongodb_client:
-                try:
-                    self.mongodb_client.update_session_status(session_id, updates)
-                except Exception as e:
-                    logger.warning(f"⚠️ Failed to update MongoDB status: {e}")
+            self._update_mongodb_status(session_id, updates)
                     
         except Exception as e:
             logger.error(f"❌ Error updating session status: {e}")
 
+    def _update_mongodb_status(self, session_id: str, updates: Dict):
+        """Queue a session status update for MongoDB, if enabled (see _flush_mongodb_status)"""
+        if self.enable_mongodb and self.mongodb_client:
+            if len(self._mongo_status_buffer) >= MONGO_BACKLOG_LIMIT:
+                # Only reachable during an outage; nothing is silently dropped
+                if self._spill_to_redis(MONGO_STATUS_BACKLOG_KEY, session_id, dict(updates)):
+                    logger.warning(
+                        f"⚠️ MongoDB status backlog full, spilled update for {session_id} to Redis "
+                        f"({self._mongo_spilled} spilled so far)"
+                    )
+                return
+            self._mongo_status_buffer.append((session_id, dict(updates)))
+            if len(self._mongo_status_buffer) >= MONGO_STATUS_BATCH:
+                self._flush_mongodb_status()
+
+    def _spill_to_redis(self, backlog_key: str, session_id: str, data: Dict) -> bool:
+        """Park a MongoDB write in a Redis list for replay; counts and logs it if even that fails"""
+        try:
+            self.redis_client.client.rpush(backlog_key, _encode_backlog_entry(session_id, data))
+            self._mongo_spilled += 1
+            return True
+        except Exception as e:
+            self._mongo_dropped += 1
+            logger.error(
+                f"❌ Dropped MongoDB write for {session_id} ({self._mongo_dropped} dropped so far): {e}"
+            )
+            return False
+
+    def _replay_extraction_backlog(self):
+        """Store extractions parked in Redis during an outage; stops at the first failure"""
+        client = self.redis_client.client
+        while True:
+            raw_entries = client.lpop(MONGO_EXTRACTION_BACKLOG_KEY, MONGO_REPLAY_BATCH)
+            if not raw_entries:
+                return
+            for index, raw in enumerate(raw_entries):
+                session_id, medical_data = _decode_backlog_entry(raw)
+                if not self.mongodb_client.store_medical_extraction(session_id, medical_data):
+                    # Put this and the rest back at the head, in order, for the next flush
+                    client.lpush(MONGO_EXTRACTION_BACKLOG_KEY, *reversed(raw_entries[index:]))
+                    logger.warning(f"⚠️ Failed to store queued medical data for {session_id}")
+                    return
+                logger.info(f"🗄️ Replayed queued medical data for session {session_id}")
+
+    def _take_status_backlog(self) -> list:
+        """Pop status updates spilled to Redis (up to one replay batch)"""
+        raw_entries = self.redis_client.client.lpop(MONGO_STATUS_BACKLOG_KEY, MONGO_REPLAY_BATCH)
+        return [_decode_backlog_entry(raw) for raw in raw_entries or []]
+
+    def _mongodb_up(self) -> bool:
+        """Cached MongoDB health; probed with a short ping once the cached state is stale"""
+        now = time.monotonic()
+        if now >= self._mongo_checked_until:
+            was_up = self._mongo_up
+            self._mongo_up = self.mongodb_client.ping_fast()
+            self._mongo_checked_until = now + (
+                MONGO_HEALTHY_RECHECK if self._mongo_up else MONGO_DOWN_RECHECK
+            )
+            if self._mongo_up != was_up:
+                if self._mongo_up:
+                    logger.info("✅ MongoDB reachable again, replaying queued writes")
+                else:
+                    logger.warning("⚠️ MongoDB unreachable, queueing writes until it recovers")
+        return self._mongo_up
+
+    def _flush_mongodb_status(self):
+        """Write all queued MongoDB status updates with one bulk_write (held while MongoDB is down)"""
+        if not self._mongodb_up():
+            return
+        with self._mongo_flush_lock:
+            try:
+                self._replay_extraction_backlog()
+            except Exception as e:
+                logger.warning(f"⚠️ Failed to replay queued medical data: {e}")
+
+            pending = []
+            while self._mongo_status_buffer:
+                pending.append(self._mongo_status_buffer.popleft())
+            try:
+                # Spilled updates are older than the buffered ones, so they go first
+                pending = self._take_status_backlog() + pending
+            except Exception as e:
+                logger.warning(f"⚠️ Failed to read spilled MongoDB status updates: {e}")
+            if not pending:
+                return
+            if self.mongodb_client.update_session_statuses(pending) is None:
+                # Keep the updates for the next flush instead of losing them
+                for session_id, updates in pending:
+                    self._spill_to_redis(MONGO_STATUS_BACKLOG_KEY, session_id, updates)
+                logger.warning(f"⚠️ Failed to update MongoDB status, kept {len(pending)} updates for replay")
+
+    def _mongodb_flush_loop(self):
+        """Flush buffered MongoDB status updates periodically while running"""
+        while self.running:
+            self._sleep_while_running(MONGO_STATUS_FLUSH_INTERVAL)
+            self._flush_mongodb_status()
+
     def _mark_extraction_skipped(self, session_id: str, reason: str) -> bool:
         """Mark medical extraction as skipped"""
         try:
@@ -380,6 +632,9 @@ class EnhancedMedicalExtractionWorker(BaseWorker):
 
     def _log_extraction_summary(self, session_id: str, medical_data: Dict):
         """Log a summary of extracted medical information"""
+        # The summary walks every section of the extraction; skip it when INFO is off
+        if not logger.isEnabledFor(logging.INFO):
+            return
         try:
             summary = []
             
@@ -415,9 +670,9 @@ class EnhancedMedicalExtractionWorker(BaseWorker):
             
             if summary:
                 storage_info = "MongoDB + Redis" if self.enable_mongodb else "Redis only"
-                logger.info(f"📋 Medical Summary for {session_id} ({storage_info}): {' | '.join(summary)}")
+                logger.info("📋 Medical Summary for %s (%s): %s", session_id, storage_info, " | ".join(summary))
             else:
-                logger.info(f"📋 No specific medical information extracted for {session_id}")
+                logger.info("📋 No specific medical information extracted for %s", session_id)
                 
         except Exception as e:
             logger.warning(f"⚠️ Error logging extraction summary: {e}")
@@ -428,6 +683,14 @@ class EnhancedMedicalExtractionWorker(BaseWorker):
             logger.info("🚀 Starting Enhanced Medical Extraction Worker with MongoDB...")
             logger.info(f"💾 Storage mode: {'Hybrid (Redis + MongoDB)' if self.enable_mongodb else 'Redis only'}")
             
+            if self.mongodb_client:
+                self._mongo_flush_thread = threading.Thread(
+                    target=self._mongodb_flush_loop,
+                    name=f"{self.worker_name}-mongo-flush",
+                    daemon=True,
+                )
+                self._mongo_flush_thread.start()
+            
             # Call parent's run method
             result = super().run()
             
@@ -435,13 +698,22 @@ class EnhancedMedicalExtractionWorker(BaseWorker):
             return result
             
         except Exception as e:
-            logger.error(f"💥 Fatal error in enhanced worker: {e}")
-            import traceback
-            logger.error(f"Full traceback: {traceback.format_exc()}")
+            logger.exception("💥 Fatal error in enhanced worker: %s", e)
             return 1
         finally:
+            if self._loop is not None:
+                self._loop.call_soon_threadsafe(self._loop.stop)
+
+            # Let queued file backups finish
+            self._io_executor.shutdown(wait=True)
+
             # Clean up MongoDB connection
             if self.mongodb_client:
+                # Stop the periodic flusher before the final flush and close
+                self.running = False
+                if self._mongo_flush_thread is not None:
+                    self._mongo_flush_thread.join()
+                self._flush_mongodb_status()
                 self.mongodb_client.close_connection()
 
 
@@ -491,9 +763,7 @@ def main():
         logger.info("📨 Received keyboard interrupt, shutting down gracefully...")
         return 0
     except Exception as e:
-        logger.error(f"💥 Failed to start enhanced medical extraction worker: {e}")
-        import traceback
-        logger.error(f"Full traceback: {traceback.format_exc()}")
+        logger.exception("💥 Failed to start enhanced medical extraction worker: %s", e)
         return 1
 
 
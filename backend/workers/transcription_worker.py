@@ -835,20 +835,11 @@ class FixedTranscriptionWorker(BaseWorker):
             try:
                 # Check for sessions that might be ready for merging
                 # FIXED: Use SCAN instead of KEYS to avoid memory issues
-                session_keys = []
-                cursor = 0
-                while True:
-                    cursor, keys = self.redis_client.client.scan(cursor, match="session_status:*", count=100)
-                    session_keys.extend(keys)
-                    if cursor == 0:
-                        break
-
-                for key in session_keys:
+                for session_id in self.redis_client.scan_session_ids(status="processing"):
                     if not self.completion_checker_running:
                         break
                         
                     try:
-                        session_id = key.split(":")[-1]
                         status_data = self.redis_client.get_session_status(session_id)
 
                         if (status_data and 
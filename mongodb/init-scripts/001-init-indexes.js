@@ -12,6 +12,7 @@ db.sessions.createIndex({ "uploaded_at": -1 });
 db.sessions.createIndex({ "status": 1 });
 db.sessions.createIndex({ "processing_strategy": 1 });
 db.sessions.createIndex({ "uploaded_at": -1, "status": 1 });
+db.sessions.createIndex({ "day_bucket": 1 });
 
 print("📝 Creating transcripts collection indexes...");
 db.transcripts.createIndex({ "session_id": 1 }, { unique: true });
@@ -26,9 +27,15 @@ db.medical_extractions.createIndex({ "extracted_at": -1 });
 db.medical_extractions.createIndex({ "patient_details.name": 1 });
 db.medical_extractions.createIndex({ "patient_details.age": 1 });
 db.medical_extractions.createIndex({ "allergies": 1 });
+// Case-insensitive allergy lookups must use the same collation as this index
+db.medical_extractions.createIndex(
+    { "allergies": 1 },
+    { name: "allergies_ci", collation: { locale: "en", strength: 2 } }
+);
 db.medical_extractions.createIndex({ "chronic_diseases": 1 });
 db.medical_extractions.createIndex({ "possible_diseases": 1 });
 db.medical_extractions.createIndex({ "extraction_metadata.method": 1 });
+db.medical_extractions.createIndex({ "chief_complaint_details.severity_num": 1 });
 
 print("🚨 Creating medical_alerts collection indexes...");
 db.medical_alerts.createIndex({ "session_id": 1 });
@@ -37,6 +44,21 @@ db.medical_alerts.createIndex({ "priority": 1 });
 db.medical_alerts.createIndex({ "alert_type": 1 });
 db.medical_alerts.createIndex({ "session_id": 1, "priority": 1 });
 
+// Alerts are upserted per (session_id, alert_type); keep only the newest of any
+// duplicates so the unique index below can be built
+db.medical_alerts.aggregate([
+    { $sort: { created_at: -1 } },
+    { $group: {
+        _id: { session_id: "$session_id", alert_type: "$alert_type" },
+        ids: { $push: "$_id" },
+        count: { $sum: 1 }
+    } },
+    { $match: { count: { $gt: 1 } } }
+], { allowDiskUse: true }).forEach(function (group) {
+    db.medical_alerts.deleteMany({ _id: { $in: group.ids.slice(1) } });
+});
+db.medical_alerts.createIndex({ "session_id": 1, "alert_type": 1 }, { unique: true });
+
 print("📊 Creating compound indexes for analytics...");
 db.medical_extractions.createIndex({ 
     "extracted_at": -1, 